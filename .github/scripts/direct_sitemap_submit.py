@@ -1,67 +1,102 @@
 #!/usr/bin/env python3
 import os
-import subprocess
 import sys
+import importlib.util
+from pathlib import Path
+
+SUBMIT_SCRIPT_NAME = "submit_status_sitemap.py"
+
+# Define the site and sitemap URL
+SITE_URL = "https://sednabcn.github.io/"
+SITEMAP_URL = "https://sednabcn.github.io/sitemap.xml"
+
+def _listdir(path):
+    """Return an 'ls -la' style listing built from cached DirEntry stat results"""
+    with os.scandir(path) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    lines = []
+    for entry in entries:
+        st = entry.stat(follow_symlinks=False)
+        lines.append(f"{st.st_mode:o} {st.st_size:>8} {entry.name}")
+    return '\n'.join(lines)
+
+def print_debug_info(cwd):
+    """Show where we are and what is around us when the submit script can't be found"""
+    print(f"Current directory: {cwd}")
+    print("Current directory contents:")
+    print('\n'.join(str(p) for p in Path('.').iterdir()))
+    print(".github/scripts contents:")
+    try:
+        with os.scandir('.github/scripts') as entries:
+            listing = '\n'.join(entry.name for entry in entries)
+    except FileNotFoundError as e:
+        listing = str(e)
+    print(listing)
+
+def load_submit_module(script_path):
+    """Load submit_status_sitemap.py as a module so it runs in-process"""
+    spec = importlib.util.spec_from_file_location("submit_status_sitemap", script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 def main():
     """
     Simple wrapper to call submit_status_sitemap.py in the same directory
     """
     print("Starting direct sitemap submission...")
-    
-    # Define the site and sitemap URL
-    site_url = "https://sednabcn.github.io/"
-    sitemap_url = "https://sednabcn.github.io/sitemap.xml"
-    
+
     # Print current directory for debugging
     cwd = os.getcwd()
     print(f"Working directory: {cwd}")
-    
+
     # List the current directory contents
     print("Directory contents:")
     try:
-        result = subprocess.run(['ls', '-la'], text=True, capture_output=True)
-        print(result.stdout)
-    except Exception as e:
+        print(_listdir('.'))
+    except OSError as e:
         print(f"Error listing directory: {e}")
-    
+
     # Get the directory of this script
     script_dir = os.path.dirname(os.path.abspath(__file__))
     print(f"Script directory: {script_dir}")
-    
+
     # Define target script path (in the same directory)
-    submit_script = os.path.join(script_dir, "submit_status_sitemap.py")
-    
+    submit_script = os.path.join(script_dir, SUBMIT_SCRIPT_NAME)
+
     # Verify the script exists
-    if not os.path.exists(submit_script):
+    if not os.path.isfile(submit_script):
         print(f"ERROR: Submit script not found at {submit_script}")
         print("Looking for script in current directory...")
-        if os.path.exists("submit_status_sitemap.py"):
-            submit_script = "./submit_status_sitemap.py"
+        if os.path.isfile(os.path.join(cwd, SUBMIT_SCRIPT_NAME)):
+            submit_script = os.path.join(".", SUBMIT_SCRIPT_NAME)
             print(f"Found script in current directory")
         else:
             print("Script not found in current directory either")
+            print_debug_info(cwd)
             sys.exit(1)
-    
-    # Execute the script
+
+    # Execute the script in-process instead of spawning a new interpreter
     print(f"Executing script: {submit_script}")
-    cmd = [sys.executable, submit_script, '--site', site_url, '--sitemaps', sitemap_url]
-    
+    argv = [submit_script, '--site', SITE_URL, '--sitemaps', SITEMAP_URL]
+
+    saved_argv = sys.argv
     try:
-        result = subprocess.run(cmd, text=True, capture_output=True)
-        print(f"Output: {result.stdout}")
-        
-        if result.stderr:
-            print(f"Errors: {result.stderr}")
-        
-        if result.returncode != 0:
-            print(f"Script failed with exit code {result.returncode}")
-            sys.exit(result.returncode)
-        else:
-            print("Sitemap submission completed successfully")
+        module = load_submit_module(submit_script)
+        sys.argv = argv
+        module.main()
+        print("Sitemap submission completed successfully")
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        if code != 0:
+            print(f"Script failed with exit code {code}")
+            sys.exit(code)
+        print("Sitemap submission completed successfully")
     except Exception as e:
         print(f"Error executing script: {e}")
         sys.exit(1)
+    finally:
+        sys.argv = saved_argv
 
 if __name__ == "__main__":
     main()
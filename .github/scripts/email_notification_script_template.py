@@ -6,35 +6,130 @@ import os
 import sys
 import smtplib
 import argparse
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import random
+import time
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import xml.etree.ElementTree as ET
 
-def send_email(subject, body, to_email, from_email, password, smtp_server="smtp.gmail.com", smtp_port=587):
-    """Send email notification"""
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+SITEMAP_URL_TAG = f'{{{SITEMAP_NS}}}url'
+SITEMAP_LOC_TAG = f'{{{SITEMAP_NS}}}loc'
+MAX_URLS_CAP = 10  # Bing allows max 10 URLs per request
+BING_WORKERS = 4
+
+# Bing URL Submission API endpoint (the API key is appended per run)
+BING_BATCH_ENDPOINT = "https://ssl.bing.com/webmaster/api.svc/json/SubmitUrlbatch?apikey="
+
+SUCCESS_TEMPLATE = """Sitemap submission completed successfully!
+
+Site: {site}
+Timestamp: {timestamp}
+URLs processed: {count}
+Result: {result}
+
+URLs submitted:
+{urls}
+{truncated}
+
+This is an automated notification from GitHub Actions."""
+
+FAILURE_TEMPLATE = """Sitemap submission encountered an error!
+
+Site: {site}
+Timestamp: {timestamp}
+URLs found: {count}
+Error: {result}
+
+Please check the GitHub Actions logs for more details.
+
+This is an automated notification from GitHub Actions."""
+
+# Shared HTTP session so repeated submissions reuse pooled keep-alive connections.
+# The adapter only retries idempotent GETs; POST rate limiting (429) is handled,
+# with a capped Retry-After, by post_bing_batch alone.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=['GET'],
+        raise_on_status=False,
+    )
+))
+
+class Mailer:
+    """Keep one authenticated SMTP connection open across several notifications"""
+    
+    def __init__(self, from_email, password, smtp_server="smtp.gmail.com", smtp_port=587):
+        self.from_email = from_email
+        self.password = password
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.server = None
+    
+    def connect(self):
+        """Open the connection, enable TLS and log in"""
+        self.server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        self.server.starttls()  # Enable security
+        self.server.login(self.from_email, self.password)
+    
+    def send(self, msg):
+        """Send a message, reconnecting if the server dropped the session"""
+        if self.server is None:
+            self.connect()
+        else:
+            try:
+                self.server.noop()
+            except smtplib.SMTPServerDisconnected:
+                self.connect()
+        
+        self.server.send_message(msg)
+    
+    def close(self):
+        """Quit the SMTP session if one is open"""
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except smtplib.SMTPException:
+                pass
+            self.server = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        self.close()
+
+def send_email(subject, body, to_email, from_email, password, smtp_server="smtp.gmail.com", smtp_port=587, mailer=None):
+    """Send email notification, reusing mailer's connection when one is given"""
     try:
         print(f"Attempting to send email to {to_email}...")
         
-        # Create message
-        msg = MIMEMultipart()
+        from email.message import EmailMessage
+        
+        # Create a single-part plain-text message
+        msg = EmailMessage()
         msg['From'] = from_email
         msg['To'] = to_email
         msg['Subject'] = subject
-        
-        # Add body to email
-        msg.attach(MIMEText(body, 'plain'))
-        
-        # Gmail SMTP configuration
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()  # Enable security
-        server.login(from_email, password)
+        msg.set_content(body)
         
         # Send email
-        text = msg.as_string()
-        server.sendmail(from_email, to_email, text)
-        server.quit()
+        if mailer is not None:
+            mailer.send(msg)
+        else:
+            with Mailer(from_email, password, smtp_server, smtp_port) as own_mailer:
+                own_mailer.send(msg)
         
         print("✅ Email sent successfully!")
         return True
@@ -44,61 +139,94 @@ def send_email(subject, body, to_email, from_email, password, smtp_server="smtp.
         print(f"Error type: {type(e).__name__}")
         return False
 
-def parse_sitemap(sitemap_path):
-    """Parse sitemap.xml and extract URLs"""
+def parse_sitemap(sitemap_path, limit=None):
+    """Parse sitemap.xml and extract URLs, streaming so the full tree is never held in memory"""
     try:
-        tree = ET.parse(sitemap_path)
-        root = tree.getroot()
-        
-        # Handle namespace
-        namespace = {'sitemap': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
         urls = []
         
-        # Extract URLs
-        for url_elem in root.findall('.//sitemap:url', namespace):
-            loc_elem = url_elem.find('sitemap:loc', namespace)
+        # Handle each <url> as soon as it is complete, then discard it
+        for event, elem in ET.iterparse(sitemap_path, events=('end',)):
+            if elem.tag != SITEMAP_URL_TAG:
+                continue
+            
+            loc_elem = elem.find(SITEMAP_LOC_TAG)
             if loc_elem is not None:
                 urls.append(loc_elem.text)
+            elem.clear()
+            
+            if limit is not None and len(urls) >= limit:
+                break
         
         return urls
     except Exception as e:
         print(f"❌ Error parsing sitemap: {e}")
         return []
 
+def post_bing_batch(endpoint, site_url, batch_urls, max_attempts=5):
+    """POST one batch of URLs to Bing, retrying timeouts and HTTP 429 with backoff and jitter"""
+    payload = {
+        "siteUrl": site_url,
+        "urlList": batch_urls
+    }
+    
+    headers = {
+        'Content-Type': 'application/json; charset=utf-8',
+    }
+    
+    for attempt in range(1, max_attempts + 1):
+        try:
+            response = SESSION.post(endpoint, json=payload, headers=headers, timeout=30)
+        except requests.Timeout:
+            if attempt == max_attempts:
+                raise
+            delay = min(2 ** attempt, 60) + random.uniform(0, 1)
+            print(f"⚠️ Bing request timed out, retrying in {delay:.1f}s (attempt {attempt}/{max_attempts})")
+            time.sleep(delay)
+            continue
+        
+        if response.status_code != 429 or attempt == max_attempts:
+            return response
+        
+        # Rate limited: wait as long as Bing asks (capped), plus jitter
+        retry_after = response.headers.get('Retry-After', '')
+        wait = min(int(retry_after), 60) if retry_after.isdigit() else min(2 ** attempt, 60)
+        delay = wait + random.uniform(0, 1)
+        print(f"⚠️ Bing rate limited the request, retrying in {delay:.1f}s (attempt {attempt}/{max_attempts})")
+        time.sleep(delay)
+
 def submit_to_bing(urls, api_key, site_url):
-    """Submit URLs to Bing Webmaster Tools"""
+    """Submit URLs to Bing Webmaster Tools in batches of MAX_URLS_CAP"""
     if not api_key:
         print("❌ No Bing API key provided")
         return False, "No API key"
     
-    try:
-        # Bing URL Submission API endpoint
-        endpoint = f"https://ssl.bing.com/webmaster/api.svc/json/SubmitUrlbatch?apikey={api_key}"
-        
-        # Prepare payload
-        payload = {
-            "siteUrl": site_url,
-            "urlList": urls[:10]  # Bing allows max 10 URLs per request
-        }
-        
-        headers = {
-            'Content-Type': 'application/json; charset=utf-8',
-        }
-        
-        response = requests.post(endpoint, json=payload, headers=headers, timeout=30)
-        
-        if response.status_code == 200:
-            print("✅ Successfully submitted URLs to Bing")
-            return True, f"Submitted {len(payload['urlList'])} URLs"
-        else:
-            error_msg = f"Bing API returned status {response.status_code}: {response.text}"
-            print(f"❌ {error_msg}")
-            return False, error_msg
-            
-    except Exception as e:
-        error_msg = f"Error submitting to Bing: {str(e)}"
+    endpoint = BING_BATCH_ENDPOINT + api_key
+    
+    batches = [urls[i:i + MAX_URLS_CAP] for i in range(0, len(urls), MAX_URLS_CAP)]
+    
+    def submit_batch(batch_urls):
+        try:
+            response = post_bing_batch(endpoint, site_url, batch_urls)
+            if response.status_code == 200:
+                return len(batch_urls), None
+            return 0, f"Bing API returned status {response.status_code}: {response.text}"
+        except Exception as e:
+            return 0, f"Error submitting to Bing: {str(e)}"
+    
+    with ThreadPoolExecutor(max_workers=BING_WORKERS) as executor:
+        results = list(executor.map(submit_batch, batches))
+    
+    submitted = sum(count for count, _ in results)
+    errors = [error for _, error in results if error]
+    
+    for error_msg in errors:
         print(f"❌ {error_msg}")
-        return False, error_msg
+    
+    if not errors:
+        print("✅ Successfully submitted URLs to Bing")
+        return True, f"Submitted {submitted} URLs in {len(batches)} batch(es)"
+    
+    return False, f"Submitted {submitted}/{len(urls)} URLs; {len(errors)} of {len(batches)} batch(es) failed: {errors[0]}"
 
 def main():
     parser = argparse.ArgumentParser(description='Submit sitemap to Bing and send email notification')
@@ -138,36 +266,21 @@ def main():
     # Prepare email content
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
     
+    fields = {
+        'site': args.site,
+        'timestamp': timestamp,
+        'count': len(urls),
+        'result': result_msg,
+    }
+    
     if success:
         subject = f"✅ Sitemap Submission Successful - {args.site}"
-        body = f"""
-Sitemap submission completed successfully!
-
-Site: {args.site}
-Timestamp: {timestamp}
-URLs processed: {len(urls)}
-Result: {result_msg}
-
-URLs submitted:
-{chr(10).join(f"• {url}" for url in urls[:10])}
-{"..." if len(urls) > 10 else ""}
-
-This is an automated notification from GitHub Actions.
-        """.strip()
+        fields['urls'] = "\n".join(f"• {url}" for url in urls[:MAX_URLS_CAP])
+        fields['truncated'] = "..." if len(urls) > MAX_URLS_CAP else ""
+        body = SUCCESS_TEMPLATE.format_map(fields)
     else:
         subject = f"❌ Sitemap Submission Failed - {args.site}"
-        body = f"""
-Sitemap submission encountered an error!
-
-Site: {args.site}
-Timestamp: {timestamp}
-URLs found: {len(urls)}
-Error: {result_msg}
-
-Please check the GitHub Actions logs for more details.
-
-This is an automated notification from GitHub Actions.
-        """.strip()
+        body = FAILURE_TEMPLATE.format_map(fields)
     
     # Send email notification
     email_sent = send_email(
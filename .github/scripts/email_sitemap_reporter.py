@@ -6,6 +6,7 @@ Integrates with the sitemap CLI tool and GitHub Actions
 """
 
 import os
+import re
 import sys
 import json
 import smtplib
@@ -13,54 +14,183 @@ import ssl
 import argparse
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
-import requests
+from typing import Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 try:
-    import markdown2
-    from jinja2 import Template
-except ImportError as e:
-    print(f"Missing dependency: {e}")
-    print("Install with: pip install markdown2 jinja2")
-    sys.exit(1)
+    import orjson
+except ImportError:
+    orjson = None
 
-class EmailSitemapReporter:
-    def __init__(self, smtp_config: Dict):
-        """Initialize email reporter with SMTP configuration"""
-        self.smtp_config = smtp_config
-        self.validate_smtp_config()
-    
-    def validate_smtp_config(self):
-        """Validate SMTP configuration"""
-        required_fields = ['server', 'port', 'username', 'password', 'from_email']
-        missing_fields = [field for field in required_fields if field not in self.smtp_config]
-        
-        if missing_fields:
-            raise ValueError(f"Missing SMTP configuration fields: {missing_fields}")
-    
-    def load_sitemap_results(self, results_file: str) -> Dict:
-        """Load sitemap monitoring results from JSON file"""
-        try:
-            with open(results_file, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Results file not found: {results_file}")
-        except json.JSONDecodeError:
-            raise ValueError(f"Invalid JSON in results file: {results_file}")
-    
-    def generate_email_template(self) -> str:
-        """Generate Jinja2 email template"""
-        return """
+# One TLS context for every SMTP connection; loading the CA bundle is not free
+_SSL_CTX = ssl.create_default_context()
+
+_TEXT_RULE = "-" * 20
+
+_DIGEST_ICONS = {'healthy': '✅', 'issues_detected': '⚠️'}
+
+_TEXT_REPORT_HEAD = (
+    "SITEMAP MONITOR REPORT\n"
+    + "=" * 50 + "\n"
+    "Site: {site}\n"
+    "Generated: {timestamp}\n"
+    "\n"
+    "STATUS: {icon} {label}\n"
+    "\n"
+    "SUMMARY\n"
+    + _TEXT_RULE + "\n"
+    "Total Sitemaps: {total}\n"
+    "Healthy Sitemaps: {healthy}\n"
+    "Issues Found: {issues}\n"
+    "Fixes Applied: {fixes}\n"
+    "\n"
+    "SITEMAP DETAILS\n"
+    + _TEXT_RULE
+)
+
+def _sitemap_text(sitemap: Dict) -> str:
+    """Plain-text block for one sitemap, ending with a blank line"""
+    extras = []
+    if sitemap.get('validation'):
+        val = sitemap['validation']
+        extras.append(f"\nValidation: {'✅ Valid' if val.get('is_valid') else '❌ Invalid'} - {val.get('message', '')}")
+    if sitemap.get('errors', 0) > 0:
+        extras.append(f"\nErrors: {sitemap['errors']}")
+    if sitemap.get('warnings', 0) > 0:
+        extras.append(f"\nWarnings: {sitemap['warnings']}")
+    return f"URL: {sitemap.get('url', 'Unknown')}\nStatus: {sitemap.get('action', 'Unknown')}{''.join(extras)}\n"
+
+def _bullet_section(title: str, items: List) -> str:
+    """Plain-text titled bullet list, ending with a blank line"""
+    return f"{title}\n{_TEXT_RULE}\n" + "".join(f"• {item}\n" for item in items)
+
+@lru_cache(maxsize=1024)
+def _fmt_dt(timestamp_str: str) -> str:
+    """Format an ISO timestamp for display; memoized since the same strings recur across records"""
+    try:
+        dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+        return dt.strftime("%B %d, %Y at %H:%M UTC")
+    except:
+        return timestamp_str
+
+def _dump_json_bytes(data) -> bytes:
+    """Compact UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+# overall_status -> (icon, header CSS class, status label, subject format)
+_STATUS_META = {
+    'healthy': ('✅', 'status-healthy', 'HEALTHY', '✅ Sitemap Status: All Healthy ({site})'),
+    'issues_detected': ('⚠️', 'status-issues', 'ISSUES DETECTED', '⚠️ Sitemap Alert: {n} Issue(s) Found ({site})'),
+    'error': ('❌', 'status-error', 'ERROR', '❌ Sitemap Error: Monitor Failed ({site})'),
+}
+
+def _status_meta(status: str):
+    """Look up display metadata for a status, treating anything unknown as an error"""
+    return _STATUS_META.get(status, _STATUS_META['error'])
+
+# Jinja2 email template, compiled once on first use (see _email_template)
+_EMAIL_TEMPLATE_SRC = """
 <!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
     <title>Sitemap Monitor Report</title>
     <style>
+{% include '_css.html' %}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <!-- Header -->
+        <div class="header {{ header_class }}">
+            <h1>
+                <span class="emoji">{{ status_icon }}</span> Sitemap Status: {{ status_label }}
+            </h1>
+            <p><strong>Site:</strong> {{ results.site_url }}</p>
+            <p><strong>Generated:</strong> {{ results.timestamp | format_datetime }}</p>
+        </div>
+
+        <!-- Summary Statistics -->
+{% include '_summary_grid.html' %}
+
+        <!-- Sitemap Details -->
+        <h2><span class="emoji">🗺️</span> Sitemap Details</h2>
+        {% for sitemap in results.sitemaps %}
+        <div class="sitemap-item {% if 'error' in sitemap.action.lower() or 'failed' in sitemap.action.lower() %}error{% elif 'warning' in sitemap.action.lower() %}warning{% endif %}">
+            <div class="sitemap-url">{{ sitemap.url }}</div>
+            
+            <div class="sitemap-details">
+                <div class="detail-item">
+                    <span class="detail-label">Status:</span> {{ sitemap.action }}
+                </div>
+                {% if sitemap.validation %}
+                <div class="detail-item">
+                    <span class="detail-label">Validation:</span> 
+                    {% if sitemap.validation.is_valid %}✅ Valid{% else %}❌ Invalid{% endif %}
+                </div>
+                {% endif %}
+                {% if sitemap.lastDownloaded %}
+                <div class="detail-item">
+                    <span class="detail-label">Last Downloaded:</span> {{ sitemap.lastDownloaded }}
+                </div>
+                {% endif %}
+                {% if sitemap.errors is defined and sitemap.errors > 0 %}
+                <div class="detail-item">
+                    <span class="detail-label">Errors:</span> <strong style="color: #dc3545;">{{ sitemap.errors }}</strong>
+                </div>
+                {% endif %}
+                {% if sitemap.warnings is defined and sitemap.warnings > 0 %}
+                <div class="detail-item">
+                    <span class="detail-label">Warnings:</span> <strong style="color: #ffc107;">{{ sitemap.warnings }}</strong>
+                </div>
+                {% endif %}
+            </div>
+        </div>
+        {% endfor %}
+
+        <!-- Issues Section -->
+        {% if results.issues_found %}
+{% include '_issues.html' %}
+        {% endif %}
+
+        <!-- Fixes Section -->
+        {% if results.fixes_applied %}
+{% include '_fixes.html' %}
+        {% endif %}
+
+        <!-- Recommendations -->
+        {% if results.summary.issues_found > 0 %}
+{% include '_recommendations.html' %}
+        {% endif %}
+
+        <!-- Action Buttons -->
+        <div style="text-align: center; margin: 30px 0;">
+            {% if workflow_url %}
+            <a href="{{ workflow_url }}" class="button">View Workflow Run</a>
+            {% endif %}
+            {% if search_console_url %}
+            <a href="{{ search_console_url }}" class="button">Open Search Console</a>
+            {% endif %}
+        </div>
+
+        <!-- Footer -->
+        <div class="footer">
+            <p>This report was automatically generated by the Sitemap Monitor system.</p>
+            <p>Next check: {{ next_check_time | format_datetime if next_check_time else 'As scheduled' }}</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+# Sub-templates included by the main template; each compiles once and is cached by the Environment
+_EMAIL_CSS_SRC = """\
         body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             line-height: 1.6;
@@ -213,26 +343,9 @@ class EmailSitemapReporter:
                 grid-template-columns: 1fr;
             }
         }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <!-- Header -->
-        <div class="header {% if results.summary.overall_status == 'healthy' %}status-healthy{% elif results.summary.overall_status == 'issues_detected' %}status-issues{% else %}status-error{% endif %}">
-            <h1>
-                {% if results.summary.overall_status == 'healthy' %}
-                    <span class="emoji">✅</span> Sitemap Status: HEALTHY
-                {% elif results.summary.overall_status == 'issues_detected' %}
-                    <span class="emoji">⚠️</span> Sitemap Status: ISSUES DETECTED
-                {% else %}
-                    <span class="emoji">❌</span> Sitemap Status: ERROR
-                {% endif %}
-            </h1>
-            <p><strong>Site:</strong> {{ results.site_url }}</p>
-            <p><strong>Generated:</strong> {{ results.timestamp | format_datetime }}</p>
-        </div>
+"""
 
-        <!-- Summary Statistics -->
+_SUMMARY_GRID_SRC = """\
         <div class="summary-grid">
             <div class="summary-card">
                 <h3>{{ results.summary.total_sitemaps }}</h3>
@@ -251,64 +364,27 @@ class EmailSitemapReporter:
                 <p>Fixes Applied</p>
             </div>
         </div>
+"""
 
-        <!-- Sitemap Details -->
-        <h2><span class="emoji">🗺️</span> Sitemap Details</h2>
-        {% for sitemap in results.sitemaps %}
-        <div class="sitemap-item {% if 'error' in sitemap.action.lower() or 'failed' in sitemap.action.lower() %}error{% elif 'warning' in sitemap.action.lower() %}warning{% endif %}">
-            <div class="sitemap-url">{{ sitemap.url }}</div>
-            
-            <div class="sitemap-details">
-                <div class="detail-item">
-                    <span class="detail-label">Status:</span> {{ sitemap.action }}
-                </div>
-                {% if sitemap.validation %}
-                <div class="detail-item">
-                    <span class="detail-label">Validation:</span> 
-                    {% if sitemap.validation.is_valid %}✅ Valid{% else %}❌ Invalid{% endif %}
-                </div>
-                {% endif %}
-                {% if sitemap.lastDownloaded %}
-                <div class="detail-item">
-                    <span class="detail-label">Last Downloaded:</span> {{ sitemap.lastDownloaded }}
-                </div>
-                {% endif %}
-                {% if sitemap.errors is defined and sitemap.errors > 0 %}
-                <div class="detail-item">
-                    <span class="detail-label">Errors:</span> <strong style="color: #dc3545;">{{ sitemap.errors }}</strong>
-                </div>
-                {% endif %}
-                {% if sitemap.warnings is defined and sitemap.warnings > 0 %}
-                <div class="detail-item">
-                    <span class="detail-label">Warnings:</span> <strong style="color: #ffc107;">{{ sitemap.warnings }}</strong>
-                </div>
-                {% endif %}
-            </div>
-        </div>
-        {% endfor %}
-
-        <!-- Issues Section -->
-        {% if results.issues_found %}
+_ISSUES_SRC = """\
         <div class="issues-section">
             <h3><span class="emoji">⚠️</span> Issues Found</h3>
             {% for issue in results.issues_found %}
             <div class="issue-item">• {{ issue }}</div>
             {% endfor %}
         </div>
-        {% endif %}
+"""
 
-        <!-- Fixes Section -->
-        {% if results.fixes_applied %}
+_FIXES_SRC = """\
         <div class="fixes-section">
             <h3><span class="emoji">🔧</span> Fixes Applied</h3>
             {% for fix in results.fixes_applied %}
             <div class="fix-item">• {{ fix }}</div>
             {% endfor %}
         </div>
-        {% endif %}
+"""
 
-        <!-- Recommendations -->
-        {% if results.summary.issues_found > 0 %}
+_RECOMMENDATIONS_SRC = """\
         <div class="recommendations">
             <h3><span class="emoji">💡</span> Recommendations</h3>
             <ul>
@@ -319,154 +395,153 @@ class EmailSitemapReporter:
                 <li>Consider implementing automated sitemap validation in your deployment process</li>
             </ul>
         </div>
-        {% endif %}
+"""
 
-        <!-- Action Buttons -->
-        <div style="text-align: center; margin: 30px 0;">
-            {% if workflow_url %}
-            <a href="{{ workflow_url }}" class="button">View Workflow Run</a>
-            {% endif %}
-            {% if search_console_url %}
-            <a href="{{ search_console_url }}" class="button">Open Search Console</a>
-            {% endif %}
-        </div>
+_EMAIL_TEMPLATES = {
+    'email.html': _EMAIL_TEMPLATE_SRC,
+    '_css.html': re.sub(r'\s+', ' ', _EMAIL_CSS_SRC).strip(),  # minified once at import
+    '_summary_grid.html': _SUMMARY_GRID_SRC,
+    '_issues.html': _ISSUES_SRC,
+    '_fixes.html': _FIXES_SRC,
+    '_recommendations.html': _RECOMMENDATIONS_SRC,
+}
 
-        <!-- Footer -->
-        <div class="footer">
-            <p>This report was automatically generated by the Sitemap Monitor system.</p>
-            <p>Next check: {{ next_check_time | format_datetime if next_check_time else 'As scheduled' }}</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+class EmailSitemapReporter:
+    def __init__(self, smtp_config: Dict):
+        """Initialize email reporter with SMTP configuration"""
+        self.smtp_config = smtp_config
+        self.validate_smtp_config()
     
-    def format_datetime_filter(self, timestamp_str: str) -> str:
-        """Custom filter to format datetime strings"""
+    def validate_smtp_config(self):
+        """Validate SMTP configuration"""
+        required_fields = ['server', 'port', 'username', 'password', 'from_email']
+        missing_fields = [field for field in required_fields if field not in self.smtp_config]
+        
+        if missing_fields:
+            raise ValueError(f"Missing SMTP configuration fields: {missing_fields}")
+    
+    def load_sitemap_results(self, results_file: str) -> Dict:
+        """Load sitemap monitoring results from JSON file"""
         try:
-            dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            return dt.strftime("%B %d, %Y at %H:%M UTC")
-        except:
-            return timestamp_str
+            if orjson is not None:
+                return orjson.loads(Path(results_file).read_bytes())
+            with open(results_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Results file not found: {results_file}")
+        except json.JSONDecodeError:
+            raise ValueError(f"Invalid JSON in results file: {results_file}")
+    
+    @staticmethod
+    def format_datetime_filter(timestamp_str: str) -> str:
+        """Custom filter to format datetime strings"""
+        return _fmt_dt(timestamp_str)
     
     def generate_html_report(self, results: Dict, workflow_url: str = None) -> str:
         """Generate HTML email report from results"""
-        template_str = self.generate_email_template()
-        template = Template(template_str)
-        
-        # Add custom filters
-        template.globals['format_datetime'] = self.format_datetime_filter
+        icon, header_class, label, _ = _status_meta(results.get('summary', {}).get('overall_status', 'unknown'))
         
         # Prepare template variables
         template_vars = {
             'results': results,
+            'status_icon': icon,
+            'header_class': header_class,
+            'status_label': label,
             'workflow_url': workflow_url,
             'search_console_url': f"https://search.google.com/search-console?resource_id={results.get('site_url', '')}",
             'next_check_time': None  # Can be calculated based on schedule
         }
         
-        return template.render(**template_vars)
+        return _email_template().render(**template_vars)
     
     def generate_text_report(self, results: Dict) -> str:
         """Generate plain text version of the report"""
-        lines = []
         summary = results.get('summary', {})
+        icon, _, label, _ = _status_meta(summary.get('overall_status', 'unknown'))
         
-        # Header
-        lines.append("SITEMAP MONITOR REPORT")
-        lines.append("=" * 50)
-        lines.append(f"Site: {results.get('site_url', 'Unknown')}")
-        lines.append(f"Generated: {results.get('timestamp', 'Unknown')}")
-        lines.append("")
-        
-        # Status
-        status = summary.get('overall_status', 'unknown')
-        if status == 'healthy':
-            lines.append("STATUS: ✅ HEALTHY")
-        elif status == 'issues_detected':
-            lines.append("STATUS: ⚠️ ISSUES DETECTED")
-        else:
-            lines.append("STATUS: ❌ ERROR")
-        lines.append("")
-        
-        # Summary
-        lines.append("SUMMARY")
-        lines.append("-" * 20)
-        lines.append(f"Total Sitemaps: {summary.get('total_sitemaps', 0)}")
-        lines.append(f"Healthy Sitemaps: {summary.get('healthy_sitemaps', 0)}")
-        lines.append(f"Issues Found: {summary.get('issues_found', 0)}")
-        lines.append(f"Fixes Applied: {summary.get('fixes_applied', 0)}")
-        lines.append("")
+        blocks = [_TEXT_REPORT_HEAD.format(
+            site=results.get('site_url', 'Unknown'),
+            timestamp=results.get('timestamp', 'Unknown'),
+            icon=icon,
+            label=label,
+            total=summary.get('total_sitemaps', 0),
+            healthy=summary.get('healthy_sitemaps', 0),
+            issues=summary.get('issues_found', 0),
+            fixes=summary.get('fixes_applied', 0)
+        )]
         
         # Sitemap details
-        lines.append("SITEMAP DETAILS")
-        lines.append("-" * 20)
-        for sitemap in results.get('sitemaps', []):
-            lines.append(f"URL: {sitemap.get('url', 'Unknown')}")
-            lines.append(f"Status: {sitemap.get('action', 'Unknown')}")
-            if sitemap.get('validation'):
-                val = sitemap['validation']
-                lines.append(f"Validation: {'✅ Valid' if val.get('is_valid') else '❌ Invalid'} - {val.get('message', '')}")
-            if sitemap.get('errors', 0) > 0:
-                lines.append(f"Errors: {sitemap['errors']}")
-            if sitemap.get('warnings', 0) > 0:
-                lines.append(f"Warnings: {sitemap['warnings']}")
-            lines.append("")
+        blocks.extend(_sitemap_text(sitemap) for sitemap in results.get('sitemaps', []))
         
-        # Issues
+        # Issues and fixes
         if results.get('issues_found'):
-            lines.append("ISSUES FOUND")
-            lines.append("-" * 20)
-            for issue in results['issues_found']:
-                lines.append(f"• {issue}")
-            lines.append("")
-        
-        # Fixes
+            blocks.append(_bullet_section("ISSUES FOUND", results['issues_found']))
         if results.get('fixes_applied'):
-            lines.append("FIXES APPLIED")
-            lines.append("-" * 20)
-            for fix in results['fixes_applied']:
-                lines.append(f"• {fix}")
-            lines.append("")
+            blocks.append(_bullet_section("FIXES APPLIED", results['fixes_applied']))
+        
+        return "\n".join(blocks)
+    
+    @contextmanager
+    def _smtp_session(self):
+        """Yield a logged-in SMTP connection that can be reused for several messages"""
+        context = _SSL_CTX
+        
+        if self.smtp_config['port'] == 465:
+            server = smtplib.SMTP_SSL(self.smtp_config['server'], self.smtp_config['port'], context=context)
+        else:
+            server = smtplib.SMTP(self.smtp_config['server'], self.smtp_config['port'])
         
-        return "\n".join(lines)
+        with server:
+            if self.smtp_config['port'] != 465:
+                server.starttls(context=context)
+            server.login(self.smtp_config['username'], self.smtp_config['password'])
+            yield server
+    
+    def _deliver(self, msg, server=None):
+        """Send msg over the given session, or open a short-lived one"""
+        if server is not None:
+            server.send_message(msg)
+            return
+        
+        with self._smtp_session() as session:
+            session.send_message(msg)
     
     def send_email(self, recipients: List[str], results: Dict, 
-                   workflow_url: str = None, include_json: bool = False) -> bool:
-        """Send email report to recipients"""
+                   workflow_url: str = None, include_json: bool = False, server=None,
+                   html: bool = True) -> bool:
+        """Send email report to recipients, reusing server's SMTP session if given.
+        With html=False only the plain-text report is rendered and sent."""
         try:
+            # Generate content
+            text_content = self.generate_text_report(results)
+            
             # Create message
-            msg = MIMEMultipart('alternative')
+            if html:
+                msg = MIMEMultipart('alternative')
+                msg.attach(MIMEText(text_content, 'plain', 'utf-8'))
+                msg.attach(MIMEText(self.generate_html_report(results, workflow_url), 'html', 'utf-8'))
+            elif include_json:
+                msg = MIMEMultipart()
+                msg.attach(MIMEText(text_content, 'plain', 'utf-8'))
+            else:
+                msg = MIMEText(text_content, 'plain', 'utf-8')
             
             # Email subject based on status
             summary = results.get('summary', {})
             status = summary.get('overall_status', 'unknown')
             issues_count = summary.get('issues_found', 0)
             
-            if status == 'healthy':
-                subject = f"✅ Sitemap Status: All Healthy ({results.get('site_url', 'Site')})"
-            elif status == 'issues_detected':
-                subject = f"⚠️ Sitemap Alert: {issues_count} Issue(s) Found ({results.get('site_url', 'Site')})"
-            else:
-                subject = f"❌ Sitemap Error: Monitor Failed ({results.get('site_url', 'Site')})"
+            subject_fmt = _status_meta(status)[3]
+            subject = subject_fmt.format_map({'site': results.get('site_url', 'Site'), 'n': issues_count})
             
             msg['Subject'] = subject
             msg['From'] = self.smtp_config['from_email']
             msg['To'] = ', '.join(recipients)
             
-            # Generate content
-            text_content = self.generate_text_report(results)
-            html_content = self.generate_html_report(results, workflow_url)
-            
-            # Attach content
-            msg.attach(MIMEText(text_content, 'plain', 'utf-8'))
-            msg.attach(MIMEText(html_content, 'html', 'utf-8'))
-            
             # Attach JSON results if requested
             if include_json:
-                json_attachment = MIMEBase('application', 'json')
-                json_attachment.set_payload(json.dumps(results, indent=2))
-                encoders.encode_base64(json_attachment)
+                from email.mime.application import MIMEApplication
+                json_attachment = MIMEApplication(_dump_json_bytes(results), _subtype='json')
                 json_attachment.add_header(
                     'Content-Disposition',
                     f'attachment; filename="sitemap-results-{datetime.now().strftime("%Y%m%d_%H%M%S")}.json"'
@@ -474,12 +549,7 @@ class EmailSitemapReporter:
                 msg.attach(json_attachment)
             
             # Send email
-            context = ssl.create_default_context()
-            
-            with smtplib.SMTP(self.smtp_config['server'], self.smtp_config['port']) as server:
-                server.starttls(context=context)
-                server.login(self.smtp_config['username'], self.smtp_config['password'])
-                server.send_message(msg)
+            self._deliver(msg, server)
             
             print(f"✅ Email sent successfully to {len(recipients)} recipient(s)")
             return True
@@ -488,13 +558,22 @@ class EmailSitemapReporter:
             print(f"❌ Failed to send email: {e}")
             return False
     
-    def send_summary_digest(self, recipients: List[str], multiple_results: List[Dict]) -> bool:
-        """Send a digest email with multiple site results"""
+    def send_summary_digest(self, recipients: List[str], multiple_results: List[Dict], server=None) -> bool:
+        """Send a digest email with multiple site results, reusing server's SMTP session if given"""
         try:
-            # Create summary of all sites
+            # Aggregate counts and per-site lines in a single pass
             total_sites = len(multiple_results)
-            healthy_sites = sum(1 for r in multiple_results if r.get('summary', {}).get('overall_status') == 'healthy')
-            total_issues = sum(r.get('summary', {}).get('issues_found', 0) for r in multiple_results)
+            healthy_sites = 0
+            total_issues = 0
+            site_lines = []
+            for result in multiple_results:
+                summary = result.get('summary') or {}
+                status = summary.get('overall_status', 'unknown')
+                issues = summary.get('issues_found', 0)
+                if status == 'healthy':
+                    healthy_sites += 1
+                total_issues += issues
+                site_lines.append(f"{_DIGEST_ICONS.get(status, '❌')} {result.get('site_url', 'Unknown')} - {issues} issues")
             
             # Create digest message
             msg = MIMEMultipart('alternative')
@@ -516,24 +595,13 @@ class EmailSitemapReporter:
             
             digest_lines.append("SITE SUMMARY")
             digest_lines.append("-" * 30)
-            
-            for result in multiple_results:
-                site = result.get('site_url', 'Unknown')
-                status = result.get('summary', {}).get('overall_status', 'unknown')
-                issues = result.get('summary', {}).get('issues_found', 0)
-                
-                status_icon = "✅" if status == 'healthy' else "⚠️" if status == 'issues_detected' else "❌"
-                digest_lines.append(f"{status_icon} {site} - {issues} issues")
+            digest_lines.extend(site_lines)
             
             digest_content = "\n".join(digest_lines)
             msg.attach(MIMEText(digest_content, 'plain', 'utf-8'))
             
             # Send digest
-            context = ssl.create_default_context()
-            with smtplib.SMTP(self.smtp_config['server'], self.smtp_config['port']) as server:
-                server.starttls(context=context)
-                server.login(self.smtp_config['username'], self.smtp_config['password'])
-                server.send_message(msg)
+            self._deliver(msg, server)
             
             print(f"✅ Digest email sent successfully to {len(recipients)} recipient(s)")
             return True
@@ -541,6 +609,68 @@ class EmailSitemapReporter:
         except Exception as e:
             print(f"❌ Failed to send digest email: {e}")
             return False
+    
+    def send_many(self, jobs: List[Tuple[List[str], Dict]], workflow_url: str = None,
+                  include_json: bool = False, html: bool = True) -> int:
+        """Send one report per (recipients, results) job over a single SMTP session"""
+        sent = 0
+        try:
+            with self._smtp_session() as server:
+                for recipients, results in jobs:
+                    if self.send_email(recipients, results, workflow_url, include_json, server=server, html=html):
+                        sent += 1
+        except Exception as e:
+            print(f"❌ Failed to open SMTP session: {e}")
+        
+        return sent
+    
+    def send_bulk(self, jobs: List[Tuple[List[str], Dict]], workflow_url: str = None,
+                  include_json: bool = False, max_workers: int = 8, html: bool = True) -> int:
+        """Send many reports in parallel; each worker renders and sends its share over its own SMTP session"""
+        if not jobs:
+            return 0
+        
+        workers = min(max_workers, len(jobs))
+        shares = [jobs[i::workers] for i in range(workers)]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            counts = executor.map(lambda share: self.send_many(share, workflow_url, include_json, html), shares)
+            return sum(counts)
+
+def _make_bytecode_cache():
+    """Jinja2 bytecode cache; later runs skip compiling only if JINJA_CACHE_DIR is persisted"""
+    from jinja2 import FileSystemBytecodeCache
+    
+    cache_dir = os.getenv('JINJA_CACHE_DIR')
+    try:
+        if not cache_dir:
+            # Jinja's own per-user 0700 directory, which it checks for ownership
+            return FileSystemBytecodeCache()
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    except (OSError, RuntimeError):
+        return None
+    return FileSystemBytecodeCache(directory=cache_dir)
+
+@lru_cache(maxsize=1)
+def _email_template():
+    """Compile the email template on first use, so text-only paths never import Jinja2"""
+    try:
+        from jinja2 import Environment, DictLoader
+    except ImportError as e:
+        print(f"Missing dependency: {e}")
+        print("Install with: pip install jinja2")
+        sys.exit(1)
+    
+    env = Environment(
+        loader=DictLoader(_EMAIL_TEMPLATES),
+        bytecode_cache=_make_bytecode_cache(),
+        autoescape=True,
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+    env.filters['format_datetime'] = _fmt_dt
+    return env.get_template('email.html')
 
 def load_email_config() -> Dict:
     """Load email configuration from environment variables"""
@@ -565,6 +695,7 @@ def main():
     parser.add_argument('--workflow-url', help='GitHub workflow URL')
     parser.add_argument('--include-json', action='store_true', help='Attach JSON results file')
     parser.add_argument('--test-email', action='store_true', help='Send test email')
+    parser.add_argument('--no-html', action='store_true', help='Send only the plain-text report')
     
     args = parser.parse_args()
     
@@ -594,12 +725,14 @@ def main():
                 'fixes_applied': []
             }
             
-            success = reporter.send_email(args.recipients, test_results, args.workflow_url, args.include_json)
+            success = reporter.send_email(args.recipients, test_results, args.workflow_url, args.include_json,
+                                          html=not args.no_html)
             sys.exit(0 if success else 1)
         
         # Load and send actual results
         results = reporter.load_sitemap_results(args.results)
-        success = reporter.send_email(args.recipients, results, args.workflow_url, args.include_json)
+        success = reporter.send_email(args.recipients, results, args.workflow_url, args.include_json,
+                                      html=not args.no_html)
         
         sys.exit(0 if success else 1)
         
@@ -1,19 +1,97 @@
 #!/usr/bin/env python3
-import os, sys, json, argparse
+import os, sys, io, gzip, json, time, zlib, argparse
 from datetime import datetime, timezone
 from typing import Dict, List, Tuple
-import requests
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+import urllib3
+try:
+    from lxml import etree
+    from lxml.etree import XMLSyntaxError as XMLParseError
+
+    def iterparse(source, events):
+        # Sitemaps have no use for entities; leaving them unexpanded defuses entity bombs
+        return etree.iterparse(source, events=events, resolve_entities=False,
+                               no_network=True, huge_tree=False)
+except ImportError:
+    # expat (2.4+) has its own limits on entity amplification
+    from xml.etree.ElementTree import iterparse, ParseError as XMLParseError
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Concurrent sitemap fetches; kept below the connection pool's maxsize
+VALIDATE_WORKERS = 8
+
+# Sitemap status lookups sent per batched Search Console request
+STATUS_BATCH_SIZE = 100
+
+# Search engines reject sitemaps larger than 50MB uncompressed
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+URL_TAG = SITEMAP_NS + 'url'
+SITEMAP_TAG = SITEMAP_NS + 'sitemap'
+
+def scan_sitemap(stream) -> Tuple[bool, str]:
+    """Count <url>/<sitemap> entries while parsing, dropping each one once counted"""
+    url_count = sitemap_count = depth = 0
+    root = None
+    for event, elem in iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                if not (elem.tag.endswith('sitemapindex') or elem.tag.endswith('urlset')):
+                    return False, "Not a valid sitemap format"
+                root = elem
+            depth += 1
+            continue
+        depth -= 1
+        if elem.tag == URL_TAG:
+            url_count += 1
+        elif elem.tag == SITEMAP_TAG:
+            sitemap_count += 1
+        if depth == 1:
+            # Finished a direct child of the root; nothing below it is still open
+            del root[:]
+    if url_count > 0:
+        return True, f"Valid sitemap with {url_count} URLs"
+    elif sitemap_count > 0:
+        return True, f"Valid sitemap index with {sitemap_count} sitemaps"
+    else:
+        return False, "Sitemap contains no URLs"
+
+def _dump_json_bytes(data, pretty: bool = False) -> bytes:
+    """UTF-8 JSON, compact unless pretty, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
 
 class SitemapMonitor:
     def __init__(self, service_account_path: str):
         self.service_account_path = service_account_path
         self.service = None
         self.site_url = None
-        self.results = {
+        # One keep-alive pool for every sitemap fetch, driven through urllib3 directly
+        self.http = urllib3.PoolManager(
+            num_pools=4, maxsize=16, block=True,
+            retries=urllib3.Retry(total=None, connect=2, read=2, redirect=30),
+            headers=urllib3.make_headers(
+                accept_encoding=True,
+                user_agent='Googlebot/2.1 (+http://www.google.com/bot.html)'
+            )
+        )
+        self.results = self._new_results()
+
+    @staticmethod
+    def _new_results() -> Dict:
+        return {
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'site_url': None,
             'sitemaps': [],
@@ -22,13 +100,21 @@ class SitemapMonitor:
             'summary': {}
         }
 
+    def close(self):
+        self.http.clear()
+
     def authenticate(self) -> bool:
+        # Reuse the client across watch cycles; google-auth refreshes its token when it expires
+        if self.service is not None:
+            return True
         try:
             credentials = service_account.Credentials.from_service_account_file(
                 self.service_account_path,
                 scopes=['https://www.googleapis.com/auth/webmasters']
             )
-            self.service = build('webmasters', 'v3', credentials=credentials)
+            # Use the discovery document bundled with googleapiclient instead of fetching it
+            self.service = build('webmasters', 'v3', credentials=credentials,
+                                 cache_discovery=False, static_discovery=True)
             print("✅ Authenticated with Google Search Console")
             return True
         except Exception as e:
@@ -38,28 +124,63 @@ class SitemapMonitor:
 
     def validate_sitemap_url(self, sitemap_url: str) -> Tuple[bool, str]:
         try:
-            response = requests.get(sitemap_url, timeout=30, headers={
-                'User-Agent': 'Googlebot/2.1 (+http://www.google.com/bot.html)'
-            })
-            if response.status_code != 200:
-                return False, f"HTTP {response.status_code}: {response.reason}"
+            response = self.http.request('GET', sitemap_url, preload_content=False, timeout=30.0)
+        except urllib3.exceptions.HTTPError as e:
+            return False, f"Request failed: {e}"
+        try:
+            if response.status != 200:
+                return False, f"HTTP {response.status}: {response.reason}"
+            # Only headers have been read so far; don't download what GSC would reject
+            content_length = response.headers.get('Content-Length', '')
+            if content_length.isdigit() and int(content_length) > MAX_SITEMAP_BYTES:
+                return False, f"Sitemap is {int(content_length)} bytes, over the 50MB limit"
+            # urllib3 undoes any Content-Encoding; a .xml.gz file is still gzip after that
+            response.decode_content = True
+            # Keep the response open at EOF so the buffered wrapper can finish reading
+            response.auto_close = False
+            stream = io.BufferedReader(response)
+            if stream.peek(2)[:2] == GZIP_MAGIC:
+                stream = gzip.GzipFile(fileobj=stream)
             try:
-                root = ET.fromstring(response.content)
-                if root.tag.endswith('sitemapindex') or root.tag.endswith('urlset'):
-                    url_count = len(root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}url'))
-                    sitemap_count = len(root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}sitemap'))
-                    if url_count > 0:
-                        return True, f"Valid sitemap with {url_count} URLs"
-                    elif sitemap_count > 0:
-                        return True, f"Valid sitemap index with {sitemap_count} sitemaps"
-                    else:
-                        return False, "Sitemap contains no URLs"
-                else:
-                    return False, "Not a valid sitemap format"
-            except ET.ParseError as e:
+                return scan_sitemap(stream)
+            except XMLParseError as e:
                 return False, f"XML parsing error: {e}"
-        except requests.RequestException as e:
+            except (gzip.BadGzipFile, EOFError, zlib.error) as e:
+                return False, f"Gzip decoding error: {e}"
+        except urllib3.exceptions.HTTPError as e:
             return False, f"Request failed: {e}"
+        finally:
+            # A fully read body has already gone back to the pool; anything
+            # left unread means the connection can't be reused, so drop it
+            response.close()
+            response.release_conn()
+
+    def _status_from_result(self, sitemap_url: str, result: Dict) -> Dict:
+        # Ensure errors and warnings are ints
+        errors = result.get('errors', 0)
+        warnings = result.get('warnings', 0)
+        try:
+            errors = int(errors)
+        except Exception:
+            errors = 0
+        try:
+            warnings = int(warnings)
+        except Exception:
+            warnings = 0
+        return {
+            'url': sitemap_url,
+            'status': 'submitted',
+            'errors': errors,
+            'warnings': warnings,
+            'isPending': result.get('isPending', False),
+            'lastDownloaded': result.get('lastDownloaded'),
+        }
+
+    def _status_from_error(self, sitemap_url: str, e: HttpError) -> Dict:
+        if e.resp.status == 404:
+            return {'url': sitemap_url, 'status': 'not_submitted', 'error': 'Not in GSC'}
+        else:
+            return {'url': sitemap_url, 'status': 'error', 'error': str(e)}
 
     def get_sitemap_status(self, site_url: str, sitemap_url: str) -> Dict:
         try:
@@ -67,30 +188,35 @@ class SitemapMonitor:
                 siteUrl=site_url,
                 feedpath=sitemap_url
             ).execute()
-            # Ensure errors and warnings are ints
-            errors = result.get('errors', 0)
-            warnings = result.get('warnings', 0)
-            try:
-                errors = int(errors)
-            except Exception:
-                errors = 0
-            try:
-                warnings = int(warnings)
-            except Exception:
-                warnings = 0
-            return {
-                'url': sitemap_url,
-                'status': 'submitted',
-                'errors': errors,
-                'warnings': warnings,
-                'isPending': result.get('isPending', False),
-                'lastDownloaded': result.get('lastDownloaded'),
-            }
         except HttpError as e:
-            if e.resp.status == 404:
-                return {'url': sitemap_url, 'status': 'not_submitted', 'error': 'Not in GSC'}
+            return self._status_from_error(sitemap_url, e)
+        return self._status_from_result(sitemap_url, result)
+
+    def get_sitemap_statuses(self, site_url: str, sitemap_urls: List[str]) -> Dict[str, Dict]:
+        """Fetch the status of several sitemaps, STATUS_BATCH_SIZE per batched HTTP request"""
+        urls = list(dict.fromkeys(sitemap_urls))
+        statuses = {}
+
+        def on_status(request_id, response, exception):
+            sitemap_url = urls[int(request_id)]
+            if exception is not None:
+                statuses[sitemap_url] = self._status_from_error(sitemap_url, exception)
             else:
-                return {'url': sitemap_url, 'status': 'error', 'error': str(e)}
+                statuses[sitemap_url] = self._status_from_result(sitemap_url, response)
+
+        for start in range(0, len(urls), STATUS_BATCH_SIZE):
+            chunk = range(start, min(start + STATUS_BATCH_SIZE, len(urls)))
+            batch = self.service.new_batch_http_request(callback=on_status)
+            for i in chunk:
+                batch.add(self.service.sitemaps().get(siteUrl=site_url, feedpath=urls[i]),
+                          request_id=str(i))
+            try:
+                batch.execute()
+            except HttpError as e:
+                # The batch request itself failed, so every lookup in it failed
+                for i in chunk:
+                    statuses[urls[i]] = self._status_from_error(urls[i], e)
+        return statuses
 
     def submit_sitemap(self, site_url: str, sitemap_url: str) -> bool:
         try:
@@ -101,31 +227,81 @@ class SitemapMonitor:
             self.results['issues_found'].append(f"Submit failed: {e}")
             return False
 
+    def submit_sitemaps(self, site_url: str, sitemap_urls: List[str]) -> Dict[str, bool]:
+        """Submit several sitemaps, STATUS_BATCH_SIZE per batched HTTP request"""
+        urls = list(dict.fromkeys(sitemap_urls))
+        failures = {}
+
+        def on_submit(request_id, response, exception):
+            if exception is not None:
+                failures[int(request_id)] = exception
+
+        for start in range(0, len(urls), STATUS_BATCH_SIZE):
+            chunk = range(start, min(start + STATUS_BATCH_SIZE, len(urls)))
+            batch = self.service.new_batch_http_request(callback=on_submit)
+            for i in chunk:
+                batch.add(self.service.sitemaps().submit(siteUrl=site_url, feedpath=urls[i]),
+                          request_id=str(i))
+            try:
+                batch.execute()
+            except HttpError as e:
+                # The batch request itself failed, so every submit in it failed
+                for i in chunk:
+                    failures[i] = e
+
+        # Record outcomes in argument order, not in the order the batch answered
+        submitted = {}
+        for i, sitemap_url in enumerate(urls):
+            if i in failures:
+                self.results['issues_found'].append(f"Submit failed: {failures[i]}")
+                submitted[sitemap_url] = False
+            else:
+                self.results['fixes_applied'].append(f"Submitted {sitemap_url}")
+                submitted[sitemap_url] = True
+        return submitted
+
     def monitor_sitemaps(self, site_url: str, sitemap_urls: List[str], force_resubmit: bool = False):
         self.site_url = site_url
+        self.results = self._new_results()
         self.results['site_url'] = site_url
         if not self.authenticate(): return self.results
 
-        for sitemap_url in sitemap_urls:
-            valid, msg = self.validate_sitemap_url(sitemap_url)
+        # Fetches are independent, so overlap them; the GSC client is not
+        # thread-safe and stays on this thread
+        with ThreadPoolExecutor(max_workers=VALIDATE_WORKERS) as ex:
+            validations = list(ex.map(self.validate_sitemap_url, sitemap_urls))
+        statuses = self.get_sitemap_statuses(
+            site_url, [url for url, (valid, _) in zip(sitemap_urls, validations) if valid])
+        to_submit = {}
+        for sitemap_url, (valid, msg) in zip(sitemap_urls, validations):
             entry = {'url': sitemap_url, 'validation': {'is_valid': valid, 'message': msg}}
             if not valid:
                 entry['status'] = 'validation_failed'
                 self.results['issues_found'].append(f"Validation failed {sitemap_url}: {msg}")
             else:
-                status = self.get_sitemap_status(site_url, sitemap_url)
+                status = statuses[sitemap_url]
                 entry.update(status)
                 errors = int(status.get('errors', 0) or 0)
                 if status['status'] == 'not_submitted' or force_resubmit:
-                    if self.submit_sitemap(site_url, sitemap_url):
-                        entry['action'] = 'submitted'
+                    to_submit[sitemap_url] = None
                 elif status['status'] == 'submitted' and errors > 0:
-                    self.submit_sitemap(site_url, sitemap_url)
-                    entry['action'] = f're-submitted (errors={errors})'
+                    to_submit[sitemap_url] = f're-submitted (errors={errors})'
                 else:
                     entry['action'] = 'healthy'
             self.results['sitemaps'].append(entry)
 
+        # Every submit goes out in one batched request instead of one round-trip each
+        if to_submit:
+            submitted = self.submit_sitemaps(site_url, list(to_submit))
+            for entry in self.results['sitemaps']:
+                url = entry['url']
+                if url not in to_submit:
+                    continue
+                if to_submit[url] is not None:
+                    entry['action'] = to_submit[url]
+                elif submitted[url]:
+                    entry['action'] = 'submitted'
+
         self.results['summary'] = {
             'total_sitemaps': len(self.results['sitemaps']),
             'issues_found': len(self.results['issues_found']),
@@ -158,17 +334,29 @@ def main():
     p.set_defaults(detailed_report=True)
     p.add_argument('--service-account', default='service-account.json')
     p.add_argument('--output-json')
+    p.add_argument('--pretty', action='store_true', help='Indent the --output-json file for humans')
     p.add_argument('--output-report')
+    p.add_argument('--watch-interval', type=int, default=0, metavar='SECONDS')
     a = p.parse_args()
 
     monitor = SitemapMonitor(a.service_account)
-    results = monitor.monitor_sitemaps(a.site, a.sitemaps, a.force_resubmit)
-    if a.output_json:
-        with open(a.output_json, 'w') as f: json.dump(results, f, indent=2)
-    report = monitor.generate_report(a.detailed_report)
-    if a.output_report:
-        with open(a.output_report, 'w') as f: f.write(report)
-    print(report)
+    try:
+        while True:
+            results = monitor.monitor_sitemaps(a.site, a.sitemaps, a.force_resubmit)
+            if a.output_json:
+                with open(a.output_json, 'wb') as f: f.write(_dump_json_bytes(results, a.pretty))
+            report = monitor.generate_report(a.detailed_report)
+            if a.output_report:
+                with open(a.output_report, 'w') as f: f.write(report)
+            print(report)
+            if a.watch_interval <= 0:
+                break
+            try:
+                time.sleep(a.watch_interval)
+            except KeyboardInterrupt:
+                break
+    finally:
+        monitor.close()
     sys.exit(0 if results['summary']['overall_status'] == 'healthy' else 1)
 
 if __name__ == "__main__": main()
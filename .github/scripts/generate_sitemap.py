@@ -10,10 +10,23 @@ import json
 import argparse
 import subprocess
 import re
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
-import xml.etree.ElementTree as ET
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = f'<urlset xmlns="{SITEMAP_NS}">\n'.encode()
+URLSET_CLOSE = b'</urlset>\n'
+# Build and dependency directories that never hold site content
+SKIP_DIRS = frozenset(['node_modules', '__pycache__', '.venv', 'venv', '.git'])
+
+# lxml serializes in C; the stdlib covers the same calls when it isn't installed
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 
 
 class SitemapGenerator:
@@ -21,64 +34,85 @@ class SitemapGenerator:
         self.base_url = base_url.rstrip('/')
         self.config = config
         self.urls = []
+        self._git_mtimes = None
+        self._readme_as_index = config.get('auto_detect', {}).get('readme_as_index', True)
+        # Scheme and host of base_url: what urljoin keeps when given an absolute path
+        self._url_root = urljoin(self.base_url, '/').rstrip('/')
         
-    def get_git_last_modified(self, file_path):
-        """Get the last modification date of a file from Git history."""
+        # Rules and exclude patterns are fixed for the run, so prepare them once
+        priority_rules = config.get('priority_rules', {})
+        self._priority_rules = [(k, v) for k, v in priority_rules.items() if k != 'default']
+        self._default_priority = priority_rules.get('default', 0.5)
+        # Priorities come from this small set, so format each one once
+        self._priority_text = {
+            priority: f"{priority:.1f}"
+            for priority in [v for _, v in self._priority_rules] + [self._default_priority]
+        }
+        changefreq_rules = config.get('changefreq_rules', {})
+        self._changefreq_rules = [(k, v) for k, v in changefreq_rules.items() if k != 'default']
+        self._default_changefreq = changefreq_rules.get('default', 'weekly')
+        
+        # Convert glob-like patterns to regex and match them all in one search
+        exclude_patterns = config.get('exclude_patterns', [])
+        self._exclude_re = re.compile('|'.join(
+            f"(?:{pattern.replace('.*', '.*').replace('*', '[^/]*')})" for pattern in exclude_patterns
+        )) if exclude_patterns else None
+        
+    def _prime_git_mtimes(self):
+        """Load the last commit time of every tracked file with a single git log."""
+        self._git_mtimes = {}
         try:
             result = subprocess.run(
-                ['git', 'log', '-1', '--format=%ct', '--', file_path],
+                ['git', 'log', '--format=@@@%ct', '--name-only', '-z', '--relative'],
                 capture_output=True,
                 text=True,
                 check=True
             )
-            if result.stdout.strip():
-                timestamp = int(result.stdout.strip())
-                return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%dT%H:%M:%S+00:00')
-            return None
-        except (subprocess.CalledProcessError, ValueError):
-            return None
+        except (subprocess.CalledProcessError, OSError):
+            return
+        
+        # Log is newest first, so the first time a path appears is its last change
+        timestamp = None
+        for token in result.stdout.split('\0'):
+            token = token.lstrip('\n')
+            if token.startswith('@@@'):
+                timestamp = int(token[3:])
+            elif token and timestamp is not None:
+                self._git_mtimes.setdefault(token, timestamp)
+    
+    def get_git_last_modified(self, file_path):
+        """Get the last modification date of a file from Git history."""
+        if self._git_mtimes is None:
+            self._prime_git_mtimes()
+        timestamp = self._git_mtimes.get(file_path)
+        if timestamp is not None:
+            return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%dT%H:%M:%S+00:00')
+        return None
     
     def get_file_priority(self, file_path):
         """Determine priority based on file path and name."""
-        priority_rules = self.config.get('priority_rules', {})
-        file_name = os.path.basename(file_path).lower()
-        
-        # Remove extension for checking
-        name_without_ext = os.path.splitext(file_name)[0]
+        # The file name is part of the path, so one containment test covers both
+        file_path_lower = file_path.lower()
         
-        # Check specific priority rules
-        for keyword, priority in priority_rules.items():
-            if keyword == 'default':
-                continue
-            if keyword in name_without_ext or keyword in file_path.lower():
+        for keyword, priority in self._priority_rules:
+            if keyword in file_path_lower:
                 return priority
         
-        return priority_rules.get('default', 0.5)
+        return self._default_priority
     
     def get_change_frequency(self, file_path):
         """Determine change frequency based on file path and type."""
-        changefreq_rules = self.config.get('changefreq_rules', {})
         file_path_lower = file_path.lower()
         
-        for keyword, freq in changefreq_rules.items():
-            if keyword == 'default':
-                continue
+        for keyword, freq in self._changefreq_rules:
             if keyword in file_path_lower:
                 return freq
         
-        return changefreq_rules.get('default', 'weekly')
+        return self._default_changefreq
     
     def should_exclude_file(self, file_path):
         """Check if file should be excluded based on patterns."""
-        exclude_patterns = self.config.get('exclude_patterns', [])
-        
-        for pattern in exclude_patterns:
-            # Convert glob-like pattern to regex
-            regex_pattern = pattern.replace('.*', '.*').replace('*', '[^/]*')
-            if re.search(regex_pattern, file_path):
-                return True
-        
-        return False
+        return bool(self._exclude_re and self._exclude_re.search(file_path))
     
     def convert_path_to_url(self, file_path):
         """Convert file path to URL."""
@@ -86,83 +120,101 @@ class SitemapGenerator:
         url_path = file_path.replace('\\', '/').lstrip('./')
         
         # Handle special cases
-        if url_path == 'README.md' and self.config.get('auto_detect', {}).get('readme_as_index', True):
+        if url_path == 'README.md' and self._readme_as_index:
             url_path = ''
-        elif url_path.endswith('/index.html') or url_path.endswith('/index.htm'):
-            url_path = url_path.rsplit('/index.', 1)[0] + '/'
-        elif url_path == 'index.html' or url_path == 'index.htm':
+        elif url_path.endswith(('/index.html', '/index.htm')):
+            url_path = url_path[:url_path.rfind('/') + 1]
+        elif url_path in ('index.html', 'index.htm'):
             url_path = ''
         elif url_path.endswith('.md'):
             # Convert markdown to HTML URL
             url_path = url_path[:-3] + '.html'
         
-        # Ensure URL starts with /
-        if url_path and not url_path.startswith('/'):
-            url_path = '/' + url_path
-        elif not url_path:
-            url_path = '/'
+        # The path is absolute, so joining it only replaces the base URL's path
+        return self._url_root + '/' + url_path
+    
+    def _iter_files(self, top='.'):
+        """Yield file DirEntry objects below top in os.walk order, reusing their cached stat."""
+        files, subdirs = [], []
+        try:
+            with os.scandir(top) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        files.append(entry)
+                    # Skip hidden directories and common build/dependency directories
+                    elif not entry.name.startswith('.') and entry.name not in SKIP_DIRS:
+                        subdirs.append(entry)
+        except OSError:
+            return
         
-        return urljoin(self.base_url, url_path)
+        yield from files
+        for entry in subdirs:
+            # Like os.walk, list symlinked directories but don't descend into them
+            if not entry.is_symlink():
+                yield from self._iter_files(entry.path)
     
     def scan_directory(self):
         """Scan directory for content files."""
         extensions = self.config.get('file_extensions', ['.html', '.htm', '.php', '.md'])
+        # One C-level endswith call per file instead of a generator over the list
+        ext_tuple = tuple(ext.lower() for ext in extensions)
         
         print(f"🔍 Scanning for files with extensions: {', '.join(extensions)}")
+        self._prime_git_mtimes()
         
-        for root, dirs, files in os.walk('.'):
-            # Skip hidden directories and common build/dependency directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in [
-                'node_modules', '__pycache__', '.venv', 'venv', '.git'
-            ]]
+        for entry in self._iter_files():
+            file = entry.name
             
-            for file in files:
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, '.')
-                
-                # Check if file has valid extension
-                if not any(file.lower().endswith(ext) for ext in extensions):
-                    continue
-                
-                # Check exclude patterns
-                if self.should_exclude_file(relative_path):
-                    continue
-                
-                # Get file metadata
-                url = self.convert_path_to_url(relative_path)
-                lastmod = self.get_git_last_modified(relative_path)
-                priority = self.get_file_priority(relative_path)
-                changefreq = self.get_change_frequency(relative_path)
-                
-                # Fallback to file system mtime if git fails
-                if lastmod is None:
-                    try:
-                        mtime = os.path.getmtime(file_path)
-                        lastmod = datetime.fromtimestamp(mtime).strftime('%Y-%m-%dT%H:%M:%S+00:00')
-                    except OSError:
-                        lastmod = datetime.now().strftime('%Y-%m-%dT%H:%M:%S+00:00')
-                
-                self.urls.append({
-                    'loc': url,
-                    'lastmod': lastmod,
-                    'changefreq': changefreq,
-                    'priority': priority,
-                    'file_path': relative_path
-                })
+            # Check if file has valid extension
+            if not file.lower().endswith(ext_tuple):
+                continue
+            
+            # Paths all start with './', which is what os.path.relpath would strip
+            relative_path = entry.path[2:]
+            
+            # Check exclude patterns
+            if self.should_exclude_file(relative_path):
+                continue
+            
+            # Get file metadata
+            url = self.convert_path_to_url(relative_path)
+            lastmod = self.get_git_last_modified(relative_path)
+            priority = self.get_file_priority(relative_path)
+            changefreq = self.get_change_frequency(relative_path)
+            
+            # Fallback to file system mtime if git fails
+            if lastmod is None:
+                try:
+                    mtime = entry.stat().st_mtime
+                    lastmod = datetime.fromtimestamp(mtime).strftime('%Y-%m-%dT%H:%M:%S+00:00')
+                except OSError:
+                    lastmod = datetime.now().strftime('%Y-%m-%dT%H:%M:%S+00:00')
+            
+            self.urls.append({
+                'loc': url,
+                'lastmod': lastmod,
+                'changefreq': changefreq,
+                'priority': priority,
+                'priority_str': self._priority_text.get(priority) or f"{priority:.1f}",
+                'file_path': relative_path
+            })
         
         print(f"📊 Found {len(self.urls)} URLs to include in sitemap")
     
     def generate_xml(self):
-        """Generate the XML sitemap."""
-        # Create root element
-        urlset = ET.Element('urlset')
-        urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-        
-        # Sort URLs by priority (descending) then by URL
-        self.urls.sort(key=lambda x: (-x['priority'], x['loc']))
+        """Generate the sitemap's <url> elements one at a time."""
+        # Sort URLs by priority (descending) then by URL; two stable passes
+        # with C-level keys avoid building a (priority, loc) tuple per URL
+        self.urls.sort(key=itemgetter('loc'))
+        self.urls.sort(key=itemgetter('priority'), reverse=True)
         
         for url_data in self.urls:
-            url_elem = ET.SubElement(urlset, 'url')
+            # Entries are serialized inside the urlset, so they inherit its namespace
+            url_elem = ET.Element('url')
             
             # Location (required)
             loc_elem = ET.SubElement(url_elem, 'loc')
@@ -181,9 +233,9 @@ class SitemapGenerator:
             # Priority (optional)
             if url_data.get('priority') is not None:
                 priority_elem = ET.SubElement(url_elem, 'priority')
-                priority_elem.text = f"{url_data['priority']:.1f}"
-        
-        return urlset
+                priority_elem.text = url_data['priority_str']
+            
+            yield url_elem
     
     def write_sitemap(self, output_file):
         """Write the sitemap to file."""
@@ -191,32 +243,15 @@ class SitemapGenerator:
             print("⚠️ No URLs found to include in sitemap")
             return False
         
-        xml_root = self.generate_xml()
-        
-        # Create XML declaration and pretty format
-        xml_str = '<?xml version="1.0" encoding="UTF-8"?>\n'
-        xml_str += ET.tostring(xml_root, encoding='unicode', method='xml')
-        
-        # Basic pretty printing
-        xml_str = xml_str.replace('><', '>\n<')
-        lines = xml_str.split('\n')
-        formatted_lines = []
-        indent_level = 0
-        
-        for line in lines:
-            if line.strip():
-                if line.strip().startswith('</') and not line.strip().startswith('</url>'):
-                    indent_level -= 1
-                
-                formatted_lines.append('  ' * indent_level + line.strip())
-                
-                if line.strip().startswith('<') and not line.strip().startswith('</') and not line.strip().endswith('/>'):
-                    if not any(tag in line for tag in ['<loc>', '<lastmod>', '<changefreq>', '<priority>']):
-                        indent_level += 1
-        
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(formatted_lines))
+            # Stream each entry to disk instead of building the whole urlset in memory
+            with open(output_file, 'wb') as f:
+                f.write(XML_DECLARATION)
+                f.write(URLSET_OPEN)
+                for url_elem in self.generate_xml():
+                    ET.indent(url_elem, level=1)
+                    f.write(b'  ' + ET.tostring(url_elem, encoding='UTF-8') + b'\n')
+                f.write(URLSET_CLOSE)
             
             print(f"✅ Sitemap written to {output_file}")
             return True
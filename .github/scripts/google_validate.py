@@ -1,8 +1,7 @@
+import io
 import os
 import sys
 import json
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 
 def main():
     sitemap_url = os.getenv("SITEMAP_URL")
@@ -18,51 +17,69 @@ def main():
         print("❌ Missing GOOGLE_SERVICE_ACCOUNT secret.")
         sys.exit(1)
 
-    creds_info = json.loads(creds_json)
+    try:
+        creds_info = json.loads(creds_json)
+    except ValueError as e:
+        print(f"❌ GOOGLE_SERVICE_ACCOUNT is not valid JSON: {e}")
+        sys.exit(1)
+
+    # Import the Google client only once the configuration is known to be usable
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
+
     creds = service_account.Credentials.from_service_account_info(
         creds_info,
         scopes=["https://www.googleapis.com/auth/webmasters"]
     )
 
-    # Build Search Console service
-    service = build("searchconsole", "v1", credentials=creds)
+    # Build Search Console service from the bundled discovery document
+    service = build("searchconsole", "v1", credentials=creds,
+                    cache_discovery=False, static_discovery=True)
+
+    report = io.StringIO()
+
+    def emit(line):
+        """Add a line to the report and echo it inside the log group."""
+        report.write(line + "\n")
+        print(line)
 
-    report_lines = []
     status_flag = "healthy"
 
+    print("::group::GSC Sitemap Report")
     try:
         # Submit sitemap to GSC
         service.sitemaps().submit(siteUrl=site_url, feedpath=sitemap_url).execute()
-        report_lines.append(f"📤 Sitemap submitted: {sitemap_url}")
+        emit(f"📤 Sitemap submitted: {sitemap_url}")
 
         # Get sitemap status
         sitemap_info = service.sitemaps().get(siteUrl=site_url, feedpath=sitemap_url).execute()
 
-        report_lines.append("### Google Search Console Status")
-        report_lines.append(f"- Last Submitted: {sitemap_info.get('lastSubmitted', 'N/A')}")
-        report_lines.append(f"- Last Checked: {sitemap_info.get('lastDownloaded', 'N/A')}")
-        report_lines.append(f"- Status: {sitemap_info.get('isPending', False) and '⏳ Pending' or '✅ Processed'}")
-        report_lines.append(f"- Warnings: {sitemap_info.get('warnings', 0)}")
-        report_lines.append(f"- Errors: {sitemap_info.get('errors', 0)}")
+        emit("### Google Search Console Status")
+        emit(f"- Last Submitted: {sitemap_info.get('lastSubmitted', 'N/A')}")
+        emit(f"- Last Checked: {sitemap_info.get('lastDownloaded', 'N/A')}")
+        emit(f"- Status: {sitemap_info.get('isPending', False) and '⏳ Pending' or '✅ Processed'}")
+        emit(f"- Warnings: {sitemap_info.get('warnings', 0)}")
+        emit(f"- Errors: {sitemap_info.get('errors', 0)}")
 
         if sitemap_info.get("errors", 0) > 0:
             status_flag = "unhealthy"
 
     except Exception as e:
-        report_lines.append(f"❌ Error while checking sitemap in GSC: {e}")
+        emit(f"❌ Error while checking sitemap in GSC: {e}")
         status_flag = "unhealthy"
+    print("::endgroup::")
 
     # Write report to file
     with open("gsc_report.md", "w") as f:
-        f.write("\n".join(report_lines))
-
-    # Also print to GitHub summary
-    print("::group::GSC Sitemap Report")
-    print("\n".join(report_lines))
-    print("::endgroup::")
+        f.write(report.getvalue())
 
     # Output status for workflow
-    print(f"::set-output name=status::{status_flag}")
+    github_output = os.getenv("GITHUB_OUTPUT")
+    if github_output:
+        with open(github_output, "a") as f:
+            f.write(f"status={status_flag}\n")
+    else:
+        print(f"status={status_flag}")
 
 if __name__ == "__main__":
     main()
@@ -9,19 +9,85 @@ import json
 import os
 import sys
 import smtplib
+import ssl
+import string
+from contextlib import contextmanager
+from functools import lru_cache
 from email.mime.text import MIMEText
-from datetime import datetime
+from datetime import datetime, timezone
 from google.auth.transport.requests import Request
 from google.auth import default
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
+SMTPS_PORT = 465
+READONLY_SCOPES = ('https://www.googleapis.com/auth/webmasters.readonly',)
+_SSL_CTX = ssl.create_default_context()
 
-def send_email_notification(to_email, subject, body):
-    """Send email notification using Gmail SMTP."""
+# One timestamp per run so stdout, the output JSON and the email body all agree
+RUN_TS = datetime.now(timezone.utc)
+RUN_TS_ISO = RUN_TS.isoformat()
+RUN_TS_HUMAN = RUN_TS.strftime('%Y-%m-%d %H:%M:%S UTC')
+
+SUMMARY_FIELDS = (
+    ('Total Pages', 'total_pages'),
+    ('Indexed Pages', 'indexed_pages'),
+    ('Crawl Errors', 'crawl_errors'),
+    ('API Available', 'api_available'),
+)
+
+# Email bodies, parsed once; build_email_body only substitutes values
+_ERROR_EMAIL_TPL = string.Template("""Google Search Console indexing check failed for $site_url
+
+Error: $error
+Timestamp: $timestamp
+
+Please check the GitHub Actions workflow logs for more details.
+Workflow URL: $workflow_url
+
+This is an automated notification from your GitHub Actions workflow.
+""")
+
+_REPORT_EMAIL_TPL = string.Template("""Google Search Console Indexing Status Report
+
+Site: $site_url
+Check Date: $timestamp
+Status: $status
+
+Summary:
+$summary
+
+$verdict
+
+For detailed analysis, check your Google Search Console dashboard:
+https://search.google.com/search-console
+
+This is an automated notification from your GitHub Actions workflow.
+""")
+
+@contextmanager
+def smtp_session():
+    """Yield a logged-in SMTP connection that can be reused for several messages."""
+    smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
+    smtp_port = int(os.getenv('SMTP_PORT', str(SMTPS_PORT)))
+    
+    # Implicit TLS on 465 saves the plaintext EHLO + STARTTLS round-trip
+    if smtp_port == SMTPS_PORT:
+        server = smtplib.SMTP_SSL(smtp_server, smtp_port, context=_SSL_CTX)
+    else:
+        server = smtplib.SMTP(smtp_server, smtp_port)
+    
+    with server:
+        if smtp_port != SMTPS_PORT:
+            server.starttls(context=_SSL_CTX)
+        server.login(os.getenv('EMAIL_FROM'), os.getenv('EMAIL_PASSWORD'))
+        yield server
+
+
+def email_config_ok(to_email):
+    """Report any missing email settings; True if everything needed to send is set."""
     email_from = os.getenv('EMAIL_FROM')
     email_password = os.getenv('EMAIL_PASSWORD')
-    smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
-    smtp_port = int(os.getenv('SMTP_PORT', '587'))
     
     if not all([email_from, email_password, to_email]):
         print("❌ Email configuration missing:")
@@ -29,6 +95,15 @@ def send_email_notification(to_email, subject, body):
         print(f"  EMAIL_PASSWORD: {'✅' if email_password else '❌'}")
         print(f"  NOTIFICATION_EMAIL: {'✅' if to_email else '❌'}")
         return False
+    return True
+
+
+def send_email_notification(to_email, subject, body, server=None):
+    """Send email notification using Gmail SMTP, over server's session if given."""
+    email_from = os.getenv('EMAIL_FROM')
+    
+    if not email_config_ok(to_email):
+        return False
     
     try:
         print(f"📧 Sending email notification to {to_email}...")
@@ -38,10 +113,11 @@ def send_email_notification(to_email, subject, body):
         msg['From'] = email_from
         msg['To'] = to_email
         
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(email_from, email_password)
+        if server is not None:
             server.send_message(msg)
+        else:
+            with smtp_session() as session:
+                session.send_message(msg)
         
         print("✅ Email sent successfully!")
         return True
@@ -51,35 +127,50 @@ def send_email_notification(to_email, subject, body):
         return False
 
 
+def send_email_notifications(recipients, subject, body):
+    """Send one message per recipient, all over a single SMTP session."""
+    if not email_config_ok(', '.join(recipients)):
+        return False
+    
+    try:
+        with smtp_session() as server:
+            sent = [send_email_notification(to_email, subject, body, server=server)
+                    for to_email in recipients]
+    except Exception as e:
+        print(f"❌ Failed to send email: {e}")
+        return False
+    return all(sent)
+
+
+@lru_cache(maxsize=None)
+def get_service(scopes):
+    """Search Console client for a tuple of scopes, built once per process."""
+    credentials, project = default(scopes=list(scopes))
+    # Build the service from the discovery document bundled with googleapiclient
+    return build('searchconsole', 'v1', credentials=credentials,
+                 cache_discovery=False, static_discovery=True)
+
+
 def get_indexing_status(site_url):
     """Get indexing status from Google Search Console API."""
     try:
-        # Initialize credentials
-        credentials, project = default(scopes=['https://www.googleapis.com/auth/webmasters.readonly'])
-        
-        # Build the service
-        service = build('searchconsole', 'v1', credentials=credentials)
-        
-        # Get site information
-        sites = service.sites().list().execute()
-        print(f"Found {len(sites.get('siteEntry', []))} sites in Search Console")
-        
-        # Check if our site is in the list
-        site_found = False
-        for site in sites.get('siteEntry', []):
-            if site['siteUrl'] == site_url:
-                site_found = True
-                break
+        service = get_service(READONLY_SCOPES)
         
-        if not site_found:
-            print(f"❌ Site {site_url} not found in Search Console")
-            return None
+        # Look the site up directly; the API answers 404 if it isn't in the account
+        try:
+            site = service.sites().get(siteUrl=site_url).execute()
+        except HttpError as e:
+            if e.resp.status == 404:
+                print(f"❌ Site {site_url} not found in Search Console")
+                return None
+            raise
+        print(f"Found {site_url} in Search Console ({site.get('permissionLevel', 'unknown')})")
         
         # Get index coverage data (this is a simplified example)
         # In practice, you'd want to make more specific API calls
         result = {
             'site_url': site_url,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': RUN_TS_ISO,
             'status': 'checked',
             'total_pages': 0,  # You'd get this from actual API calls
             'indexed_pages': 0,
@@ -100,23 +191,56 @@ def get_indexing_status(site_url):
         print(f"❌ Error getting indexing status: {e}")
         return {
             'site_url': site_url,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': RUN_TS_ISO,
             'status': 'error',
             'error': str(e),
             'api_available': False
         }
 
 
+def _render_list(items):
+    """Bulleted lines for a list of values, joined once."""
+    return '\n'.join(f'• {item}' for item in items)
+
+
+def build_email_body(site_url, status_data):
+    """Build the plain-text report body from the precompiled templates."""
+    if status_data.get('status') == 'error':
+        workflow_url = (f"{os.getenv('GITHUB_SERVER_URL', 'https://github.com')}/"
+                        f"{os.getenv('GITHUB_REPOSITORY', 'your-repo')}/actions/runs/"
+                        f"{os.getenv('GITHUB_RUN_ID', 'N/A')}")
+        return _ERROR_EMAIL_TPL.substitute(
+            site_url=site_url,
+            error=status_data.get('error', 'Unknown error'),
+            timestamp=status_data.get('timestamp'),
+            workflow_url=workflow_url,
+        )
+    
+    summary = [f'{label}: {status_data.get(key, "N/A")}' for label, key in SUMMARY_FIELDS]
+    if status_data.get('crawl_errors', 0) > 0:
+        verdict = '⚠️ Action Required: Crawl errors detected!'
+    else:
+        verdict = '✅ All looks good!'
+    return _REPORT_EMAIL_TPL.substitute(
+        site_url=site_url,
+        timestamp=status_data.get('timestamp'),
+        status=status_data.get('status', 'unknown'),
+        summary=_render_list(summary),
+        verdict=verdict,
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(description='Monitor Google Search Console indexing status')
     parser.add_argument('--site', required=True, help='Site URL to monitor')
     parser.add_argument('--output', help='Output JSON file path')
-    parser.add_argument('--email', help='Email address to send notifications to')
+    parser.add_argument('--pretty', action='store_true', help='Indent the output JSON for humans')
+    parser.add_argument('--email', help='Email address(es) to send notifications to, comma-separated')
     args = parser.parse_args()
     
     print("=== Google Indexing Status Monitor ===")
     print(f"Site: {args.site}")
-    print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    print(f"Timestamp: {RUN_TS_HUMAN}")
     
     # Get indexing status
     status_data = get_indexing_status(args.site)
@@ -128,8 +252,11 @@ def main():
     # Save to output file if specified
     if args.output:
         try:
-            with open(args.output, 'w') as f:
-                json.dump(status_data, f, indent=2)
+            with open(args.output, 'w', encoding='utf-8') as f:
+                if args.pretty:
+                    json.dump(status_data, f, indent=2, ensure_ascii=False)
+                else:
+                    json.dump(status_data, f, separators=(',', ':'), ensure_ascii=False)
             print(f"✅ Status saved to {args.output}")
         except Exception as e:
             print(f"❌ Failed to save output file: {e}")
@@ -140,38 +267,10 @@ def main():
         
         if status_data.get('status') == 'error':
             subject = f"❌ Google Indexing Check Failed - {args.site}"
-            body = f"""Google Search Console indexing check failed for {args.site}
-
-Error: {status_data.get('error', 'Unknown error')}
-Timestamp: {status_data.get('timestamp')}
-
-Please check the GitHub Actions workflow logs for more details.
-Workflow URL: {os.getenv('GITHUB_SERVER_URL', 'https://github.com')}/{os.getenv('GITHUB_REPOSITORY', 'your-repo')}/actions/runs/{os.getenv('GITHUB_RUN_ID', 'N/A')}
-
-This is an automated notification from your GitHub Actions workflow.
-"""
-        else:
-            body = f"""Google Search Console Indexing Status Report
-
-Site: {args.site}
-Check Date: {status_data.get('timestamp')}
-Status: {status_data.get('status', 'unknown')}
-
-Summary:
-• Total Pages: {status_data.get('total_pages', 'N/A')}
-• Indexed Pages: {status_data.get('indexed_pages', 'N/A')}
-• Crawl Errors: {status_data.get('crawl_errors', 'N/A')}
-• API Available: {status_data.get('api_available', 'N/A')}
-
-{'⚠️ Action Required: Crawl errors detected!' if status_data.get('crawl_errors', 0) > 0 else '✅ All looks good!'}
-
-For detailed analysis, check your Google Search Console dashboard:
-https://search.google.com/search-console
-
-This is an automated notification from your GitHub Actions workflow.
-"""
+        body = build_email_body(args.site, status_data)
         
-        email_sent = send_email_notification(args.email, subject, body)
+        recipients = [addr.strip() for addr in args.email.split(',') if addr.strip()]
+        email_sent = send_email_notifications(recipients, subject, body)
         if not email_sent:
             print("⚠️ Continuing despite email failure...")
     
@@ -5,6 +5,7 @@ Save this as test_email.py and run locally or add as a workflow step
 """
 import os
 import smtplib
+import ssl
 from email.mime.text import MIMEText
 
 # Get from environment or prompt
@@ -27,10 +28,8 @@ try:
     msg['From'] = email_from
     msg['To'] = email_to
 
-    print("Connecting to Gmail SMTP...")
-    with smtplib.SMTP('smtp.gmail.com', 587) as server:
-        print("Starting TLS...")
-        server.starttls()
+    print("Connecting to Gmail SMTP over SSL...")
+    with smtplib.SMTP_SSL('smtp.gmail.com', 465, context=ssl.create_default_context()) as server:
         print("Logging in...")
         server.login(email_from, email_password)
         print("Sending...")
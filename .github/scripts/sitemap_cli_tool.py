@@ -29,6 +29,10 @@ except ImportError as e:
 
 colorama.init()
 
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+URL_TAG = SITEMAP_NS + 'url'
+SITEMAP_TAG = SITEMAP_NS + 'sitemap'
+
 class SitemapCLI:
     def __init__(self, service_account_path: str):
         self.service_account_path = service_account_path
@@ -42,7 +46,8 @@ class SitemapCLI:
                 self.service_account_path,
                 scopes=['https://www.googleapis.com/auth/webmasters']
             )
-            self.service = build('webmasters', 'v3', credentials=credentials)
+            self.service = build('webmasters', 'v3', credentials=credentials,
+                                 cache_discovery=False, static_discovery=True)
             self.authenticated = True
             print(f"{Fore.GREEN}✅ Successfully authenticated with Google Search Console{Style.RESET_ALL}")
             return True
@@ -134,15 +139,15 @@ class SitemapCLI:
             # Parse XML
             try:
                 root = ET.fromstring(response.content)
-                namespace = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
                 
-                # Check if it's a sitemap or sitemap index
+                # Check if it's a sitemap or sitemap index; entries are direct
+                # children of the root, so count them in one pass over it
                 if root.tag.endswith('sitemapindex'):
-                    sitemaps = root.findall('.//sm:sitemap', namespace)
-                    return True, f"Valid sitemap index with {len(sitemaps)} sitemaps"
+                    sitemap_count = sum(1 for child in root if child.tag == SITEMAP_TAG)
+                    return True, f"Valid sitemap index with {sitemap_count} sitemaps"
                 elif root.tag.endswith('urlset'):
-                    urls = root.findall('.//sm:url', namespace)
-                    return True, f"Valid sitemap with {len(urls)} URLs"
+                    url_count = sum(1 for child in root if child.tag == URL_TAG)
+                    return True, f"Valid sitemap with {url_count} URLs"
                 else:
                     return False, "Not a valid sitemap XML format"
                     
@@ -180,7 +185,7 @@ class SitemapCLI:
             }
             
             if root.tag.endswith('urlset'):
-                urls = root.findall('.//sm:url', namespace)
+                urls = [child for child in root if child.tag == URL_TAG]
                 analysis['total_urls'] = len(urls)
                 
                 for url in urls:
@@ -11,11 +11,13 @@ import requests
 from typing import List, Dict, Optional, Tuple
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Set up global constants
 USER_AGENT = "Mozilla/5.0 (compatible; SitemapSubmitter/1.0; +https://github.com/sitemap-tools)"
 SEARCH_CONSOLE_API_BASE = "https://www.googleapis.com/webmasters/v3"
 SITEMAP_NAMESPACE = {'sitemap': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+LINK_CHECK_WORKERS = 4
 
 class SitemapTool:
     def __init__(self, site_url: str, sitemap_path: str, credentials_path: Optional[str] = None, verbose: bool = False):
@@ -112,39 +114,40 @@ class SitemapTool:
             print(f"Error parsing sitemap URLs: {e}")
             return False, []
     
+    def _check_link(self, url: str) -> Optional[Dict]:
+        """HEAD a single URL and return a broken-link record, or None if it is valid"""
+        try:
+            response = requests.head(url, headers={'User-Agent': USER_AGENT}, timeout=10, allow_redirects=True)
+            
+            if response.status_code >= 400:
+                print(f"❌ Broken link ({response.status_code}): {url}")
+                return {
+                    'url': url,
+                    'status': response.status_code,
+                    'error': f"HTTP {response.status_code}"
+                }
+            
+            self.log(f"✅ Valid link: {url}")
+            return None
+                
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error checking: {url}")
+            print(f"   {str(e)}")
+            return {
+                'url': url,
+                'status': -1,
+                'error': str(e)
+            }
+    
     def check_links(self, urls: List[str]) -> List[Dict]:
         """Check all links in the sitemap for broken URLs"""
-        broken_links = []
-        
         print(f"Checking {len(urls)} links for availability...")
-        for index, url in enumerate(urls):
-            try:
-                response = requests.head(url, headers={'User-Agent': USER_AGENT}, timeout=10, allow_redirects=True)
-                
-                if response.status_code >= 400:
-                    print(f"❌ Broken link ({response.status_code}): {url}")
-                    broken_links.append({
-                        'url': url,
-                        'status': response.status_code,
-                        'error': f"HTTP {response.status_code}"
-                    })
-                else:
-                    self.log(f"✅ Valid link: {url}")
-                    
-                # Add small delay to avoid rate limiting
-                if index > 0 and index % 10 == 0:
-                    time.sleep(1)
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"❌ Error checking: {url}")
-                print(f"   {str(e)}")
-                broken_links.append({
-                    'url': url,
-                    'status': -1,
-                    'error': str(e)
-                })
         
-        return broken_links
+        # Requests are I/O bound, so overlap them; keep the pool small to avoid rate limiting
+        with ThreadPoolExecutor(max_workers=LINK_CHECK_WORKERS) as executor:
+            results = list(executor.map(self._check_link, urls))
+        
+        return [result for result in results if result is not None]
     
     def check_sitemap_status(self) -> Dict:
         """Check if sitemap is already submitted and indexed by Google"""
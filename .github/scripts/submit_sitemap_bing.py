@@ -16,6 +16,11 @@ from typing import List
 from datetime import datetime
 
 
+# --- Sitemap parsing config ---
+SITEMAP_NAMESPACE = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+SITEMAP_LOC_XPATH = 'ns:url/ns:loc'
+BARE_LOC_XPATH = './/loc'
+
 # --- Email notification config ---
 SMTP_SERVER = 'smtp.gmail.com'
 SMTP_PORT = 587  # TLS port
@@ -98,12 +103,11 @@ def parse_sitemap(file_path: str) -> List[str]:
         root = tree.getroot()
         
         # Handle different possible namespaces
-        namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-        urls = [elem.text for elem in root.findall('ns:url/ns:loc', namespace)]
+        urls = [elem.text for elem in root.findall(SITEMAP_LOC_XPATH, SITEMAP_NAMESPACE)]
         
         # If no URLs found with namespace, try without
         if not urls:
-            urls = [elem.text for elem in root.findall('.//loc')]
+            urls = [elem.text for elem in root.findall(BARE_LOC_XPATH)]
             
         print(f"✅ Found {len(urls)} URLs in sitemap")
         return urls
@@ -5,12 +5,14 @@
 import os
 import sys
 import argparse
+import hashlib
 import json
+import random
+import time
 from datetime import datetime
+from functools import lru_cache
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import pickle
@@ -19,8 +21,22 @@ import tabulate
 # If modifying these scopes, delete the file token.pickle
 SCOPES = ['https://www.googleapis.com/auth/webmasters']
 
+# Calls per batched HTTP request (the API accepts up to 1000)
+SUBMIT_BATCH_SIZE = 100
+# Rate-limited calls are retried this many times, waiting at most MAX_RETRY_DELAY seconds
+SUBMIT_RETRIES = 5
+MAX_RETRY_DELAY = 60
+RETRYABLE_STATUSES = (429, 503)
+# Verified-site list is shared by every invocation in the same workflow job for this long
+SITES_CACHE_TTL = 300
+
+@lru_cache(maxsize=1)
 def get_credentials():
-    """Get valid user credentials from storage, user authentication, or service account."""
+    """Get valid user credentials from storage, user authentication, or service account.
+    
+    Cached, so the key file is read and parsed once per process; google-auth
+    refreshes the token on the returned object when it expires.
+    """
     creds = None
     
     # First, check if there's a service account key file
@@ -41,6 +57,7 @@ def get_credentials():
     # If credentials don't exist or are invalid, let the user log in
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
+            from google.auth.transport.requests import Request
             creds.refresh(Request())
         else:
             # Look for client_secret.json
@@ -51,6 +68,7 @@ def get_credentials():
                     print("Please provide a service-account.json file for CI environments.")
                     sys.exit(1)
                 
+                from google_auth_oauthlib.flow import InstalledAppFlow
                 flow = InstalledAppFlow.from_client_secrets_file('client_secret.json', SCOPES)
                 # Use port 8080 instead of a dynamic port
                 creds = flow.run_local_server(port=8080)
@@ -66,16 +84,109 @@ def get_credentials():
     
     return creds
 
+@lru_cache(maxsize=1)
+def get_service():
+    """Build the Search Console service once per process, using the bundled discovery document."""
+    creds = get_credentials()
+    return build('searchconsole', 'v1', credentials=creds,
+                 cache_discovery=False, static_discovery=True)
+
+def _sites_cache_path(creds):
+    """Per-job, per-account cache file for the site list; None outside GitHub Actions or for an unknown account."""
+    runner_temp = os.getenv('RUNNER_TEMP')
+    # Key on who is asking, so a reused runner never serves another account's sites
+    account = getattr(creds, 'service_account_email', None) or getattr(creds, 'client_id', None)
+    if not runner_temp or not account:
+        return None
+    digest = hashlib.sha256(account.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(runner_temp, f'gsc_sites_{digest}.json')
+
+def get_site_entries(service):
+    """Sites in the Search Console account, fetched at most once per SITES_CACHE_TTL within a job."""
+    cache_path = _sites_cache_path(get_credentials())
+    if cache_path:
+        try:
+            if time.time() - os.path.getmtime(cache_path) < SITES_CACHE_TTL:
+                with open(cache_path, 'r') as f:
+                    return tuple(json.load(f))
+        except (OSError, ValueError):
+            pass
+    
+    site_entries = tuple(service.sites().list().execute().get('siteEntry', ()))
+    if cache_path:
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump(site_entries, f)
+        except OSError:
+            pass
+    return site_entries
+
 def submit_sitemap(service, site_url, sitemap_url):
     """Submit a sitemap to Google Search Console."""
     try:
-        service.sitemaps().submit(siteUrl=site_url, feedpath=sitemap_url).execute()
+        # The client backs off exponentially on 429/5xx by itself
+        service.sitemaps().submit(siteUrl=site_url, feedpath=sitemap_url).execute(num_retries=SUBMIT_RETRIES)
         print(f"Successfully submitted sitemap: {sitemap_url}")
         return True
     except HttpError as error:
         print(f"Error submitting sitemap {sitemap_url}: {error}")
         return False
 
+def _is_rate_limited(error):
+    """True for an HttpError the server expects to be retried later."""
+    return isinstance(error, HttpError) and error.resp.status in RETRYABLE_STATUSES
+
+def _retry_delay(error, attempt):
+    """Seconds to wait before a retry: the server's Retry-After, else exponential backoff with jitter."""
+    retry_after = error.resp.get('retry-after')
+    if retry_after and retry_after.isdigit():
+        return min(int(retry_after), MAX_RETRY_DELAY)
+    return min(2 ** attempt + random.random(), MAX_RETRY_DELAY)
+
+def submit_sitemaps(service, site_url, sitemap_urls):
+    """Submit several sitemaps, SUBMIT_BATCH_SIZE per batched HTTP request. Returns the success count."""
+    if len(sitemap_urls) == 1:
+        return int(submit_sitemap(service, site_url, sitemap_urls[0]))
+    
+    errors = {}
+    
+    def on_submit(request_id, response, exception):
+        if exception is not None:
+            errors[int(request_id)] = exception
+        else:
+            errors.pop(int(request_id), None)
+    
+    pending = list(range(len(sitemap_urls)))
+    for attempt in range(SUBMIT_RETRIES + 1):
+        for start in range(0, len(pending), SUBMIT_BATCH_SIZE):
+            chunk = pending[start:start + SUBMIT_BATCH_SIZE]
+            batch = service.new_batch_http_request(callback=on_submit)
+            for i in chunk:
+                batch.add(service.sitemaps().submit(siteUrl=site_url, feedpath=sitemap_urls[i]),
+                          request_id=str(i))
+            try:
+                batch.execute()
+            except HttpError as error:
+                # The batch request itself failed, so every call in it failed
+                for i in chunk:
+                    errors[i] = error
+        
+        # Only calls the server asked us to slow down on are worth repeating
+        pending = [i for i in pending if _is_rate_limited(errors.get(i))]
+        if not pending or attempt == SUBMIT_RETRIES:
+            break
+        delay = max(_retry_delay(errors[i], attempt) for i in pending)
+        print(f"Rate limited on {len(pending)} sitemap(s), retrying in {delay:.1f}s...")
+        time.sleep(delay)
+    
+    # Report in argument order, whatever order the batch answered in
+    for i, sitemap_url in enumerate(sitemap_urls):
+        if i in errors:
+            print(f"Error submitting sitemap {sitemap_url}: {errors[i]}")
+        else:
+            print(f"Successfully submitted sitemap: {sitemap_url}")
+    return len(sitemap_urls) - len(errors)
+
 def get_sitemap_details(sitemap):
     """Extract and format detailed information about a sitemap."""
     path = sitemap.get('path', 'Unknown')
@@ -123,13 +234,14 @@ def get_sitemap_details(sitemap):
     }
 
 def check_sitemap_status(service, site_url, sitemap_url=None, detailed=False):
-    """Check status of sitemaps in Google Search Console."""
+    """Check status of sitemaps in Google Search Console.
+    Returns the get_sitemap_details() dict of each sitemap shown, or None on an API error."""
     try:
         response = service.sitemaps().list(siteUrl=site_url).execute()
         
         if 'sitemap' not in response or not response['sitemap']:
             print("No sitemaps found for this site.")
-            return
+            return []
         
         sitemaps = response['sitemap']
         
@@ -138,15 +250,16 @@ def check_sitemap_status(service, site_url, sitemap_url=None, detailed=False):
             sitemaps = [s for s in sitemaps if s['path'] == sitemap_url]
             if not sitemaps:
                 print(f"Sitemap {sitemap_url} not found in Google Search Console.")
-                return
+                return []
+        
+        all_details = [get_sitemap_details(sitemap) for sitemap in sitemaps]
         
         if detailed:
             # Create table data
             table_data = []
             headers = ["Sitemap", "Type", "Status", "Last Read", "Discovered URLs"]
             
-            for sitemap in sitemaps:
-                details = get_sitemap_details(sitemap)
+            for details in all_details:
                 table_data.append([
                     details['path'],
                     details['type'],
@@ -160,8 +273,7 @@ def check_sitemap_status(service, site_url, sitemap_url=None, detailed=False):
             print(tabulate.tabulate(table_data, headers=headers, tablefmt="grid"))
             
             # Print any warnings or errors
-            for sitemap in sitemaps:
-                details = get_sitemap_details(sitemap)
+            for details in all_details:
                 if details['warnings'] != '0' or details['errors'] != '0':
                     print(f"\nIssues with {details['path']}:")
                     if details['errors'] != '0':
@@ -171,19 +283,25 @@ def check_sitemap_status(service, site_url, sitemap_url=None, detailed=False):
         else:
             # Simple listing format
             print("\nCurrently submitted sitemaps:")
-            for sitemap in sitemaps:
-                details = get_sitemap_details(sitemap)
+            for sitemap, details in zip(sitemaps, all_details):
                 status_text = f"Status: {details['status']}"
                 if 'lastDownloaded' in sitemap:
                     status_text += f", Last fetched: {details['last_read']}"
                 print(f"- {details['path']} ({status_text})")
         
+        return all_details
+        
     except HttpError as error:
         print(f"Error checking sitemap status: {error}")
+        return None
 
 def list_sitemaps(service, site_url):
     """List all sitemaps for a site in Search Console."""
-    check_sitemap_status(service, site_url, detailed=False)
+    return check_sitemap_status(service, site_url, detailed=False)
+
+def print_json_result(site_url, sitemaps, **extra):
+    """Print one machine-readable JSON line; sitemaps is None when the API call failed."""
+    print(json.dumps({'site': site_url, 'sitemaps': sitemaps, **extra}))
 
 def main():
     parser = argparse.ArgumentParser(description='Submit and manage sitemaps in Google Search Console')
@@ -192,6 +310,7 @@ def main():
     parser.add_argument('--list', '-l', action='store_true', help='List existing sitemaps')
     parser.add_argument('--status', action='store_true', help='Check detailed status of sitemaps')
     parser.add_argument('--check', help='Check status of a specific sitemap')
+    parser.add_argument('--json', action='store_true', help='End with a one-line JSON result for other scripts to parse')
     
     args = parser.parse_args()
     
@@ -204,8 +323,7 @@ def main():
     
     # Get credentials and build service
     try:
-        creds = get_credentials()
-        service = build('searchconsole', 'v1', credentials=creds)
+        service = get_service()
         print(f"Connected to Google Search Console API for site: {site_url}")
     except Exception as e:
         print(f"Failed to initialize service: {e}")
@@ -213,20 +331,16 @@ def main():
     
     # Check if the site is verified
     try:
-        sites = service.sites().list().execute()
-        site_found = False
+        site_entries = get_site_entries(service)
         
-        if 'siteEntry' in sites:
-            for site in sites['siteEntry']:
-                if site['siteUrl'] == site_url:
-                    site_found = True
-                    if site.get('permissionLevel') in ['siteOwner', 'siteFullUser']:
-                        print(f"Site {site_url} is verified with permission level: {site.get('permissionLevel')}")
-                    else:
-                        print(f"WARNING: You only have {site.get('permissionLevel')} permission for this site.")
-                    break
+        site = next((s for s in site_entries if s['siteUrl'] == site_url), None)
         
-        if not site_found:
+        if site is not None:
+            if site.get('permissionLevel') in ['siteOwner', 'siteFullUser']:
+                print(f"Site {site_url} is verified with permission level: {site.get('permissionLevel')}")
+            else:
+                print(f"WARNING: You only have {site.get('permissionLevel')} permission for this site.")
+        else:
             print(f"WARNING: Site {site_url} is not found in your Search Console account.")
             print("You may need to verify ownership of this site first.")
     except HttpError as error:
@@ -234,25 +348,31 @@ def main():
     
     # Check status of specific sitemap if requested
     if args.check:
-        check_sitemap_status(service, site_url, args.check, detailed=True)
+        result = check_sitemap_status(service, site_url, args.check, detailed=True)
+        if args.json:
+            print_json_result(site_url, result)
         sys.exit(0)
     
     # Check detailed status of all sitemaps if requested
     if args.status:
-        check_sitemap_status(service, site_url, detailed=True)
+        result = check_sitemap_status(service, site_url, detailed=True)
+        if args.json:
+            print_json_result(site_url, result)
         sys.exit(0)
     
     # List existing sitemaps if requested
     if args.list:
-        list_sitemaps(service, site_url)
+        result = list_sitemaps(service, site_url)
         if not args.sitemaps:
+            if args.json:
+                print_json_result(site_url, result)
             sys.exit(0)
     
     # Submit sitemaps if provided
     if args.sitemaps:
         print(f"Submitting {len(args.sitemaps)} sitemap(s)...")
         
-        success_count = 0
+        sitemaps = []
         for sitemap in args.sitemaps:
             # If sitemap doesn't start with http, assume it's a relative path
             if not sitemap.startswith('http'):
@@ -260,14 +380,16 @@ def main():
                 if sitemap.startswith('/'):
                     sitemap = sitemap[1:]
                 # No need to join with site_url as the API expects paths
-            
-            if submit_sitemap(service, site_url, sitemap):
-                success_count += 1
+            sitemaps.append(sitemap)
+        
+        success_count = submit_sitemaps(service, site_url, sitemaps)
         
         print(f"Sitemap submission completed! {success_count}/{len(args.sitemaps)} successful.")
         
         # List updated sitemaps
-        list_sitemaps(service, site_url)
+        result = list_sitemaps(service, site_url)
+        if args.json:
+            print_json_result(site_url, result, submitted=success_count, requested=len(sitemaps))
     elif not args.list and not args.status and not args.check:
         parser.print_help()
 
@@ -6,6 +6,7 @@ Run this locally to test your email settings before using in GitHub Actions
 
 import os
 import smtplib
+import ssl
 from email.mime.text import MIMEText
 from datetime import datetime
 
@@ -32,7 +33,7 @@ Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
 If you received this email, your configuration is working correctly!
 
 Test details:
-- SMTP Server: smtp.gmail.com:587
+- SMTP Server: smtp.gmail.com:465 (SSL)
 - From: {email_from}
 - To: {email_to}
 
@@ -52,11 +53,8 @@ Next steps:
     msg['To'] = email_to
     
     try:
-        print("\nConnecting to Gmail SMTP server...")
-        with smtplib.SMTP('smtp.gmail.com', 587) as server:
-            print("Starting TLS encryption...")
-            server.starttls()
-            
+        print("\nConnecting to Gmail SMTP server over SSL...")
+        with smtplib.SMTP_SSL('smtp.gmail.com', 465, context=ssl.create_default_context()) as server:
             print("Authenticating...")
             server.login(email_from, email_password)
             
@@ -71,18 +71,19 @@ def has_structural_changes():
         # since the last sitemap.xml commit
         result = subprocess.run(
             ['git', 'log', '-1', '--format=%H', '--', 'sitemap.xml'],
-            capture_output=True, text=True, check=True
+            capture_output=True, check=True
         )
-        last_sitemap_commit = result.stdout.strip()
+        last_sitemap_commit = result.stdout.strip().decode('ascii')
         
         if not last_sitemap_commit:
             # No previous sitemap commit found, do a full rebuild
             return True
             
         # Check if any HTML files were added, removed, or modified since the last sitemap update
+        # Only emptiness matters here, so the (possibly long) listing is never decoded
         result = subprocess.run(
             ['git', 'diff', '--name-status', last_sitemap_commit, 'HEAD', '--', '*.html'],
-            capture_output=True, text=True, check=True
+            capture_output=True, check=True
         )
         
         # If there are any changes to HTML files, return True
@@ -107,9 +108,9 @@ def get_last_commit_date(file_path):
         # Get the last commit date for the file
         result = subprocess.run(
             ['git', 'log', '-1', '--format=%ci', '--', file_path],
-            capture_output=True, text=True, check=True
+            capture_output=True, check=True
         )
-        date_str = result.stdout.strip()
+        date_str = result.stdout.strip().decode('utf-8')
         if date_str:
             # Parse the date
             commit_date = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S %z')
@@ -10,11 +10,36 @@ import sys
 import argparse
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 from urllib.parse import urljoin, urlparse
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from xml.sax.saxutils import escape
+
+# lxml parses in C; the stdlib covers the same calls when it isn't installed
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+LINK_SCAN_WORKERS = 8
+
+HREF_RE = re.compile(rb'href=["\']([^"\']+)["\']', re.IGNORECASE)
+
+# Constructs whose match depends on what follows; patterns using them can't prune directories
+END_SENSITIVE_TOKENS = ('$', '\\Z', '\\b', '\\B', '(?=', '(?!')
+
+# Path keywords behind the built-in priority and changefreq heuristics
+HOME_WORDS_RE = re.compile('index|home')
+BLOG_WORDS_RE = re.compile('blog|news|posts')
+KEY_PAGE_WORDS_RE = re.compile('about|contact|services')
+STATIC_WORDS_RE = re.compile('about|contact|terms|privacy')
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+URL_TAG = f'{{{SITEMAP_NS}}}url'
+
+XML_HEADER = f'<?xml version="1.0" ?>\n<urlset xmlns="{SITEMAP_NS}">'
+XML_TEXT_ENTITIES = {'"': '&quot;'}
 
 
 class SitemapGenerator:
@@ -33,6 +58,23 @@ class SitemapGenerator:
             r'.*404\.html$', r'.*error\.html$'
         ])
         self.include_patterns = self.config.get('include_patterns', [])
+        self._extensions = tuple(ext.lower() for ext in self.file_extensions)
+        self._exclude_res = [re.compile(pattern, re.IGNORECASE) for pattern in self.exclude_patterns]
+        self._include_res = [re.compile(pattern, re.IGNORECASE) for pattern in self.include_patterns]
+        # re.match only anchors the start, so a directory matching one of
+        # these patterns means every path below it matches too
+        self._prune_res = [
+            regex for regex in self._exclude_res
+            if not any(token in regex.pattern for token in END_SENSITIVE_TOKENS)
+        ]
+        priority_rules = self.config.get('priority_rules', {})
+        self._priority_rules = tuple((key, priority) for key, priority in priority_rules.items()
+                                     if key != 'default')
+        self._default_priority = priority_rules.get('default', 0.5)
+        self._changefreq_rules = self.config.get('changefreq_rules', {})
+        self._scan_result = None
+        self._file_index = None
+        self._link_cache = {}
         
     def load_config(self, config_file):
         """Load configuration from JSON file if provided."""
@@ -111,30 +153,27 @@ class SitemapGenerator:
         file_str = str(file_path)
         
         # Check exclude patterns first
-        for pattern in self.exclude_patterns:
-            if re.match(pattern, file_str, re.IGNORECASE):
+        for regex in self._exclude_res:
+            if regex.match(file_str):
                 return False
         
         # If include patterns are specified, file must match one
-        if self.include_patterns:
-            for pattern in self.include_patterns:
-                if re.match(pattern, file_str, re.IGNORECASE):
-                    return True
-            return False
+        if self._include_res:
+            return any(regex.match(file_str) for regex in self._include_res)
         
         # Check file extension
-        return file_path.suffix.lower() in [ext.lower() for ext in self.file_extensions]
+        return file_path.suffix.lower() in self._extensions
     
     def extract_links_from_html(self, html_file):
         """Extract internal links from HTML files."""
         links = set()
         try:
-            with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
+            with open(html_file, 'rb') as f:
                 content = f.read()
                 
-            # Find href attributes
-            href_pattern = r'href=["\']([^"\']+)["\']'
-            matches = re.findall(href_pattern, content, re.IGNORECASE)
+            # Find href attributes on the raw bytes and decode only the matches
+            matches = {match.decode('utf-8', 'ignore') for match in set(HREF_RE.findall(content))}
+            parent = Path(html_file).parent
             
             for match in matches:
                 # Skip external links, anchors, mailto, etc.
@@ -145,91 +184,142 @@ class SitemapGenerator:
                         links.add(match)
                     else:
                         # Relative to current file
-                        rel_path = Path(html_file).parent / match
-                        try:
-                            abs_path = rel_path.resolve().relative_to(self.project_path)
-                            links.add('/' + str(abs_path).replace('\\', '/'))
-                        except ValueError:
-                            # Path is outside project
-                            pass
+                        link = self._resolve_relative_link(parent, match)
+                        if link:
+                            links.add(link)
                             
         except Exception as e:
             print(f"⚠️ Warning: Could not extract links from {html_file}: {e}")
         
         return links
     
+    def _resolve_relative_link(self, parent, href):
+        """Resolve a relative href to a site path, caching per directory."""
+        key = (parent, href)
+        if key not in self._link_cache:
+            try:
+                abs_path = (parent / href).resolve().relative_to(self.project_path)
+                # Project-relative (no leading slash), unlike root-relative hrefs kept as written
+                self._link_cache[key] = str(abs_path).replace('\\', '/')
+            except ValueError:
+                # Path is outside project
+                self._link_cache[key] = None
+        return self._link_cache[key]
+    
     def get_file_priority(self, file_path):
         """Determine priority based on file path and name."""
-        path_str = str(file_path).lower()
-        filename = file_path.stem.lower()
-        
-        priority_rules = self.config.get('priority_rules', {})
-        
+        return self._priority_for(str(file_path).lower(), file_path.stem.lower())
+    
+    def _priority_for(self, path_str, filename):
+        """Priority for an already lower-cased path and file stem."""
         # Check specific filename matches
-        for key, priority in priority_rules.items():
-            if key == 'default':
-                continue
+        for key, priority in self._priority_rules:
             if key in filename or key in path_str:
                 return priority
         
         # Special cases
-        if filename in ['index', 'home', 'main']:
+        if filename in ('index', 'home', 'main'):
             return 1.0
         elif 'index' in filename:
             return 0.9
-        elif any(word in path_str for word in ['about', 'contact', 'services']):
+        elif KEY_PAGE_WORDS_RE.search(path_str):
             return 0.8
-        elif any(word in path_str for word in ['blog', 'news', 'posts']):
+        elif BLOG_WORDS_RE.search(path_str):
             return 0.7
         
-        return priority_rules.get('default', 0.5)
+        return self._default_priority
     
     def get_change_frequency(self, file_path):
         """Determine change frequency based on file path and type."""
-        path_str = str(file_path).lower()
-        
-        changefreq_rules = self.config.get('changefreq_rules', {})
+        return self._change_frequency_for(str(file_path).lower())
+    
+    def _change_frequency_for(self, path_str):
+        """Change frequency for an already lower-cased path."""
+        changefreq_rules = self._changefreq_rules
         
-        if 'index' in path_str or 'home' in path_str:
+        if HOME_WORDS_RE.search(path_str):
             return changefreq_rules.get('index', 'weekly')
-        elif any(word in path_str for word in ['blog', 'news', 'posts']):
+        elif BLOG_WORDS_RE.search(path_str):
             return changefreq_rules.get('blog', 'weekly')
-        elif any(word in path_str for word in ['about', 'contact', 'terms', 'privacy']):
+        elif STATIC_WORDS_RE.search(path_str):
             return changefreq_rules.get('static', 'monthly')
         
         return changefreq_rules.get('default', 'weekly')
     
+    def classify_file(self, file_path):
+        """Return (changefreq, priority) for a file in a single pass over its path."""
+        path_str = str(file_path).lower()
+        return (self._change_frequency_for(path_str),
+                self._priority_for(path_str, file_path.stem.lower()))
+    
     def get_last_modified(self, file_path):
-        """Get last modified time of file."""
+        """Get last modified time of a file, path or scandir DirEntry."""
         try:
-            timestamp = os.path.getmtime(file_path)
+            if isinstance(file_path, os.DirEntry):
+                timestamp = file_path.stat().st_mtime
+            else:
+                timestamp = os.path.getmtime(file_path)
             return datetime.fromtimestamp(timestamp, tz=timezone.utc)
         except:
             return datetime.now(tz=timezone.utc)
     
+    def _scandir_recursive(self, path):
+        """Yield file DirEntry objects below path in a single scandir walk."""
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            return
+        
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry)
+                elif entry.is_file():
+                    yield entry
+            except OSError:
+                continue
+        
+        for entry in subdirs:
+            if any(regex.match(entry.path) for regex in self._prune_res):
+                continue
+            yield from self._scandir_recursive(entry.path)
+    
     def scan_files(self):
         """Scan project directory for files to include in sitemap."""
+        if self._scan_result is not None:
+            return self._scan_result
+        
         print(f"📁 Scanning directory: {self.project_path}")
         
         found_files = []
+        html_files = []
         html_links = set()
+        scan_html_links = self.config.get('auto_detect', {}).get('scan_html_links', True)
         
         # Walk through all files
-        for file_path in self.project_path.rglob('*'):
-            if file_path.is_file() and self.should_include_file(file_path):
-                found_files.append(file_path)
+        for entry in self._scandir_recursive(str(self.project_path)):
+            file_path = Path(entry.path)
+            if self.should_include_file(file_path):
+                found_files.append((file_path, entry))
                 
                 # Extract links from HTML files
-                if (file_path.suffix.lower() in ['.html', '.htm'] and 
-                    self.config.get('auto_detect', {}).get('scan_html_links', True)):
-                    links = self.extract_links_from_html(file_path)
+                if scan_html_links and file_path.suffix.lower() in ('.html', '.htm'):
+                    html_files.append(file_path)
+        
+        # Reading and scanning each HTML file is independent work
+        if html_files:
+            with ThreadPoolExecutor(max_workers=LINK_SCAN_WORKERS) as executor:
+                for links in executor.map(self.extract_links_from_html, html_files):
                     html_links.update(links)
         
         print(f"📄 Found {len(found_files)} files")
         if html_links:
             print(f"🔗 Extracted {len(html_links)} internal links")
         
-        return found_files, html_links
+        self._scan_result = (found_files, html_links)
+        return self._scan_result
     
     def convert_path_to_url(self, file_path):
         """Convert file system path to URL."""
@@ -255,12 +345,35 @@ class SitemapGenerator:
             elif not url_path:
                 url_path = '/'
                 
-            return urljoin(self.base_url, url_path)
+            # Append rather than urljoin: an absolute path would replace any
+            # path component of the base URL (e.g. a project-site /repo prefix)
+            return self.base_url + url_path
             
         except ValueError:
             # File is outside project directory
             return None
     
+    def index_files(self):
+        """Build the sitemap entry of every scanned file once, keyed by URL."""
+        if self._file_index is not None:
+            return self._file_index
+        
+        files, _ = self.scan_files()
+        file_index = {}
+        for file_path, dir_entry in files:
+            url = self.convert_path_to_url(file_path)
+            if url and url not in file_index:
+                changefreq, priority = self.classify_file(file_path)
+                file_index[url] = {
+                    'loc': url,
+                    'lastmod': self.get_last_modified(dir_entry).isoformat(),
+                    'changefreq': changefreq,
+                    'priority': priority
+                }
+        
+        self._file_index = file_index
+        return file_index
+    
     def generate_sitemap_data(self):
         """Generate sitemap data structure."""
         print("🔄 Generating sitemap data...")
@@ -268,35 +381,28 @@ class SitemapGenerator:
         # Detect project type for optimization
         project_type, all_types = self.detect_project_type()
         
-        # Scan for files
-        files, html_links = self.scan_files()
+        # Scan for files; each one is resolved to its entry only once
+        file_index = self.index_files()
+        html_links = self.scan_files()[1]
         
-        sitemap_entries = []
-        processed_urls = set()
-        
-        # Process files
-        for file_path in files:
-            url = self.convert_path_to_url(file_path)
-            if url and url not in processed_urls:
-                processed_urls.add(url)
-                
-                entry = {
-                    'loc': url,
-                    'lastmod': self.get_last_modified(file_path).isoformat(),
-                    'changefreq': self.get_change_frequency(file_path),
-                    'priority': self.get_file_priority(file_path)
-                }
-                sitemap_entries.append(entry)
+        sitemap_entries = list(file_index.values())
+        processed_urls = set(file_index)
         
         # Process HTML links that might not correspond to files
+        base_dir = self.base_url + '/'
+        now_iso = datetime.now(tz=timezone.utc).isoformat()
         for link in html_links:
-            url = urljoin(self.base_url, link)
+            if link.startswith('/'):
+                # Root-relative hrefs already carry any base path; resolve against the host
+                url = urljoin(self.base_url, link)
+            else:
+                url = base_dir + link
             if url not in processed_urls:
                 processed_urls.add(url)
                 
                 entry = {
                     'loc': url,
-                    'lastmod': datetime.now(tz=timezone.utc).isoformat(),
+                    'lastmod': now_iso,
                     'changefreq': 'weekly',
                     'priority': 0.5
                 }
@@ -312,49 +418,52 @@ class SitemapGenerator:
         """Create sitemap.xml file."""
         print(f"📝 Creating sitemap.xml with {len(entries)} URLs...")
         
-        # Create root element
-        urlset = ET.Element('urlset')
-        urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-        
-        # Add URLs
-        for entry in entries:
-            url_elem = ET.SubElement(urlset, 'url')
-            
-            loc_elem = ET.SubElement(url_elem, 'loc')
-            loc_elem.text = entry['loc']
-            
-            lastmod_elem = ET.SubElement(url_elem, 'lastmod')
-            lastmod_elem.text = entry['lastmod']
-            
-            changefreq_elem = ET.SubElement(url_elem, 'changefreq')
-            changefreq_elem.text = entry['changefreq']
-            
-            priority_elem = ET.SubElement(url_elem, 'priority')
-            priority_elem.text = f"{entry['priority']:.1f}"
-        
-        # Format XML nicely
-        rough_string = ET.tostring(urlset, 'utf-8')
-        reparsed = minidom.parseString(rough_string)
-        pretty_xml = reparsed.toprettyxml(indent='  ')
-        
-        # Remove extra blank lines
-        pretty_xml = '\n'.join([line for line in pretty_xml.split('\n') if line.strip()])
-        
-        # Write to file
+        # Write URL blocks straight to the file in the same indented layout
+        tails = {}
         output_path = Path(output_path)
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(pretty_xml)
+            f.write(XML_HEADER)
+            f.writelines(self._url_block(entry, tails) for entry in entries)
+            f.write("\n</urlset>")
         
         print(f"✅ Sitemap saved to {output_path.absolute()}")
         return output_path
     
+    def _url_block(self, entry, tails):
+        """Format one <url> block, reusing the changefreq/priority tail across entries."""
+        key = (entry['changefreq'], entry['priority'])
+        tail = tails.get(key)
+        if tail is None:
+            tail = tails[key] = (
+                f"\n    <changefreq>{escape(entry['changefreq'], XML_TEXT_ENTITIES)}</changefreq>"
+                f"\n    <priority>{entry['priority']:.1f}</priority>"
+                f"\n  </url>"
+            )
+        return (
+            f"\n  <url>"
+            f"\n    <loc>{escape(entry['loc'], XML_TEXT_ENTITIES)}</loc>"
+            f"\n    <lastmod>{entry['lastmod']}</lastmod>"
+            f"{tail}"
+        )
+    
     def validate_sitemap(self, sitemap_path):
         """Basic validation of generated sitemap."""
         try:
-            tree = ET.parse(sitemap_path)
-            root = tree.getroot()
-            
-            url_count = len(root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}url'))
+            # Count while parsing and drop each finished entry, so memory
+            # stays flat however large the sitemap is
+            url_count = depth = 0
+            root = None
+            for event, elem in ET.iterparse(str(sitemap_path), events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                    depth += 1
+                    continue
+                depth -= 1
+                if elem.tag == URL_TAG:
+                    url_count += 1
+                if depth == 1:
+                    del root[:]
             
             print(f"✅ Sitemap validation passed: {url_count} URLs")
             
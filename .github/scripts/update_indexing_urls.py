@@ -68,7 +68,9 @@ def request_indexing(site, urls, delay=5, dry_run=False):
         log.write("-" * 80 + "\n\n")
         
         for i, url in enumerate(urls):
-            command = f"python3.12 ./scripts/search_console_management_.py --site {site} request-indexing {url}"
+            # Run the command directly rather than through a shell, so the URL is never shell-parsed
+            argv = ["python3.12", "./scripts/search_console_management_.py", "--site", site, "request-indexing", url]
+            command = " ".join(argv)
             
             log.write(f"[{i+1}/{len(urls)}] {url}\n")
             log.write(f"Command: {command}\n")
@@ -81,8 +83,7 @@ def request_indexing(site, urls, delay=5, dry_run=False):
             else:
                 try:
                     result = subprocess.run(
-                        command, 
-                        shell=True, 
+                        argv, 
                         stdout=subprocess.PIPE, 
                         stderr=subprocess.PIPE,
                         text=True
@@ -8,6 +8,7 @@ import os
 import sys
 import json
 import argparse
+import importlib.util
 import subprocess
 from pathlib import Path
 from datetime import datetime
@@ -16,14 +17,14 @@ from datetime import datetime
 def get_git_last_modified(file_path):
     """Get the last modification date of a file from Git history."""
     try:
+        # Output stays bytes: int() parses them directly, so nothing is decoded
         result = subprocess.run(
             ['git', 'log', '-1', '--format=%ct', '--', file_path],
             capture_output=True,
-            text=True,
             check=True
         )
         if result.stdout.strip():
-            return int(result.stdout.strip())
+            return int(result.stdout)
         return None
     except (subprocess.CalledProcessError, ValueError):
         return None
@@ -106,38 +107,52 @@ def should_regenerate_sitemap(config, force=False):
     return False
 
 
+GENERATOR_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'generate_sitemap.py')
+
+
+def load_generator_module(script_path):
+    """Load generate_sitemap.py as a module so it runs in this interpreter."""
+    spec = importlib.util.spec_from_file_location("generate_sitemap", script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
 def run_sitemap_generator(base_url, config_file, output_file):
-    """Run the main sitemap generator."""
+    """Run the main sitemap generator in-process."""
+    argv = [
+        GENERATOR_SCRIPT,
+        '--base-url', base_url,
+        '--config', config_file,
+        '--output', output_file,
+        '--verbose'
+    ]
+    
+    print(f"🚀 Running: {' '.join(argv)}")
+    print("📤 Generator output:", flush=True)
+    
     try:
-        cmd = [
-            sys.executable, 'generate_sitemap.py',
-            base_url,
-            '--config', config_file,
-            '--output', output_file,
-            '--verbose'
-        ]
-        
-        print(f"🚀 Running: {' '.join(cmd)}")
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        
-        print("📤 Generator output:")
-        if result.stdout:
-            print(result.stdout)
-        if result.stderr:
-            print("⚠️ Warnings/Errors:")
-            print(result.stderr)
-            
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Sitemap generator failed with exit code {e.returncode}")
-        if e.stdout:
-            print("📤 stdout:", e.stdout)
-        if e.stderr:
-            print("📤 stderr:", e.stderr)
-        return False
+        module = load_generator_module(GENERATOR_SCRIPT)
     except FileNotFoundError:
         print("❌ generate_sitemap.py script not found")
         return False
+    
+    saved_argv = sys.argv
+    try:
+        sys.argv = argv
+        module.main()
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        if code != 0:
+            print(f"❌ Sitemap generator failed with exit code {code}")
+            return False
+    except Exception as e:
+        print(f"❌ Sitemap generator failed: {e}")
+        return False
+    finally:
+        sys.argv = saved_argv
+    
+    return True
 
 
 def main():